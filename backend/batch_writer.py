@@ -0,0 +1,98 @@
+"""
+Batched Background Writes
+
+Queues documents for a MongoDB collection and writes them with insert_many
+from a background task, so request handlers don't wait on a round-trip for
+records nobody reads back immediately (activity/audit entries).
+
+Writes are best-effort: failures are logged, not raised to the caller.
+
+Usage:
+    from batch_writer import BatchWriter
+
+    activity_log = BatchWriter(db.activities)
+    activity_log.add({"id": ..., "activity_type": "created", ...})
+
+    # On shutdown
+    await activity_log.aclose()
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Queued by aclose(); the flusher writes the batch it holds and exits
+_CLOSE = object()
+
+
+class BatchWriter:
+    """Background insert_many writer for a single collection"""
+
+    def __init__(self, collection, batch_size: int = 100, flush_interval: float = 0.05):
+        """
+        Args:
+            collection: Motor collection to insert into
+            batch_size: Maximum documents per insert_many
+            flush_interval: Seconds to wait for more documents after the first
+        """
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # The flusher is started lazily on first add, since there may be no
+        # running loop when the writer is constructed at import time
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._flusher_task: Optional[asyncio.Task] = None
+
+    def add(self, document: dict):
+        """Queue a document for insertion (must be called from the event loop)"""
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.create_task(self._flusher())
+        self._queue.put_nowait(document)
+
+    async def aclose(self):
+        """Stop the flusher once it has written everything queued before the call"""
+        task, self._flusher_task = self._flusher_task, None
+        if task is not None and not task.done():
+            self._queue.put_nowait(_CLOSE)
+            await task
+        batch = []
+        while not self._queue.empty():
+            document = self._queue.get_nowait()
+            if document is not _CLOSE:
+                batch.append(document)
+        if batch:
+            await self._write(batch)
+
+    async def _flusher(self):
+        """Drain the queue, writing up to batch_size documents per insert_many"""
+        loop = asyncio.get_running_loop()
+        while True:
+            document = await self._queue.get()
+            if document is _CLOSE:
+                return
+            batch = [document]
+            closing = False
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    document = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if document is _CLOSE:
+                    closing = True
+                    break
+                batch.append(document)
+            await self._write(batch)
+            if closing:
+                return
+
+    async def _write(self, batch: list):
+        try:
+            await self.collection.insert_many(batch, ordered=False)
+        except Exception as e:
+            logger.error("Failed to write %d document(s) to %s: %s", len(batch), self.collection.name, e)
@@ -0,0 +1,75 @@
+"""
+In-Process TTL Cache
+
+Small LRU cache with per-entry expiry, used to keep hot lookups (authenticated
+users, repeated reads) out of MongoDB between requests.
+
+Each worker process holds its own copy, so entries must be safe to serve for
+up to their TTL without cross-process invalidation. Within a process the
+cache is safe to share between the event loop and thread pool workers.
+
+Usage:
+    from cache import TTLCache
+
+    users = TTLCache(maxsize=1024, ttl=60)
+    users.set(key, user)
+    user = users.get(key)  # None once expired or evicted
+
+    # Values computed across an await can be dropped if the cache was cleared meanwhile
+    generation = users.generation
+    user = await load_user()
+    if users.generation == generation:
+        users.set(key, user)
+"""
+
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+import threading
+import time
+
+
+class TTLCache:
+    """LRU mapping whose entries expire ttl seconds after being set"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expires_at, value), least recently used first
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # Incremented by clear(), so writers can detect an invalidation in between
+        self.generation = 0
+        # Guards _data and generation; get() reorders entries, so reads need it too
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value; ttl overrides the cache default for this entry"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
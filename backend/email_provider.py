@@ -20,12 +20,36 @@ Usage:
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
+import asyncio
+import functools
 import os
+import threading
 import logging
-import json
+
+from batch_writer import BatchWriter
 
 logger = logging.getLogger(__name__)
 
+# Demo provider log batching: flush after this many entries or this many seconds
+LOG_BATCH_SIZE = 100
+LOG_FLUSH_INTERVAL = 0.5
+
+# Console format for demo emails (formatted lazily by logging)
+DEMO_EMAIL_LOG_FORMAT = """
+========== DEMO EMAIL ==========
+Message ID: %s
+From: %s <%s>
+To: %s
+CC: %s
+Subject: %s
+--------------------------------
+%s...
+================================
+"""
+
+SENDGRID_API_URL = "https://api.sendgrid.com"
+SENDGRID_SEND_PATH = "/v3/mail/send"
+
 
 class EmailResult:
     """Result of an email send operation"""
@@ -33,7 +57,7 @@ class EmailResult:
         self.success = success
         self.message_id = message_id
         self.error = error
-        self.timestamp = datetime.now(timezone.utc).isoformat()
+        self.timestamp = datetime.now(timezone.utc)
 
 
 class EmailProvider(ABC):
@@ -75,6 +99,10 @@ class EmailProvider(ABC):
         """
         pass
     
+    async def aclose(self):
+        """Release any resources held by the provider"""
+        pass
+    
     @property
     @abstractmethod
     def provider_name(self) -> str:
@@ -100,6 +128,11 @@ class DemoEmailProvider(EmailProvider):
         self.db = db
         self.default_from_email = "noreply@mccareglobal.com"
         self.default_from_name = "McCare Global ATS"
+        # Log entries are written in batches in the background
+        self._log_writer = (
+            BatchWriter(db.notification_logs, LOG_BATCH_SIZE, LOG_FLUSH_INTERVAL)
+            if db is not None else None
+        )
         logger.info("DemoEmailProvider initialized - emails will be logged, not sent")
     
     @property
@@ -128,20 +161,14 @@ class DemoEmailProvider(EmailProvider):
         sender_name = from_name or self.default_from_name
         
         # Log to console
-        logger.info(f"""
-========== DEMO EMAIL ==========
-Message ID: {message_id}
-From: {sender_name} <{sender_email}>
-To: {', '.join(to)}
-CC: {', '.join(cc or [])}
-Subject: {subject}
---------------------------------
-{text or html[:500]}...
-================================
-""")
+        logger.info(
+            DEMO_EMAIL_LOG_FORMAT,
+            message_id, sender_name, sender_email, ", ".join(to), ", ".join(cc or []),
+            subject, text or html[:500]
+        )
         
         # Store in database if available
-        if self.db is not None:
+        if self._log_writer is not None:
             log_entry = {
                 "id": message_id,
                 "type": metadata.get("notification_type") if metadata else "general",
@@ -159,12 +186,15 @@ Subject: {subject}
                 "sent_at": None,  # Not actually sent
                 "error_message": None
             }
-            try:
-                await self.db.notification_logs.insert_one(log_entry)
-            except Exception as e:
-                logger.error(f"Failed to log email to database: {e}")
+            # Logging is best-effort in demo mode, so don't hold up the caller
+            self._log_writer.add(log_entry)
         
         return EmailResult(success=True, message_id=message_id)
+    
+    async def aclose(self):
+        """Write any log entries still queued"""
+        if self._log_writer is not None:
+            await self._log_writer.aclose()
 
 
 class SendGridEmailProvider(EmailProvider):
@@ -172,7 +202,7 @@ class SendGridEmailProvider(EmailProvider):
     SendGrid email provider.
     
     Requires: SENDGRID_API_KEY environment variable
-    To enable: pip install sendgrid
+    To enable: pip install httpx
     """
     
     def __init__(self, api_key: str = None):
@@ -181,13 +211,22 @@ class SendGridEmailProvider(EmailProvider):
             raise ValueError("SENDGRID_API_KEY environment variable is required")
         
         try:
-            from sendgrid import SendGridAPIClient
-            self.client = SendGridAPIClient(self.api_key)
+            import httpx
         except ImportError:
-            raise ImportError("sendgrid package required. Install with: pip install sendgrid")
+            raise ImportError("httpx package required. Install with: pip install httpx")
+        
+        # One pooled keep-alive client for the provider's lifetime, so sends reuse
+        # TLS connections and don't block the event loop
+        self._http = httpx.AsyncClient(
+            base_url=SENDGRID_API_URL,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(10.0)
+        )
         
         self.default_from_email = os.environ.get('SENDGRID_FROM_EMAIL', 'noreply@mccareglobal.com')
         self.default_from_name = os.environ.get('SENDGRID_FROM_NAME', 'McCare Global ATS')
+        self._default_from = {"email": self.default_from_email, "name": self.default_from_name}
         logger.info("SendGridEmailProvider initialized")
     
     @property
@@ -209,28 +248,32 @@ class SendGridEmailProvider(EmailProvider):
         metadata: Optional[Dict[str, Any]] = None
     ) -> EmailResult:
         """Send email via SendGrid API"""
-        from sendgrid.helpers.mail import Mail, Email, To, Content, Cc, Bcc
-        
         try:
-            message = Mail(
-                from_email=Email(from_email or self.default_from_email, from_name or self.default_from_name),
-                to_emails=[To(email) for email in to],
-                subject=subject,
-                html_content=Content("text/html", html)
-            )
+            # Build the v3 JSON payload directly rather than via helper objects
+            personalization = {"to": [{"email": email} for email in to]}
+            if cc:
+                personalization["cc"] = [{"email": email} for email in cc]
+            if bcc:
+                personalization["bcc"] = [{"email": email} for email in bcc]
             
+            # SendGrid requires text/plain to precede text/html
+            content = [{"type": "text/html", "value": html}]
             if text:
-                message.add_content(Content("text/plain", text))
-            
-            if cc:
-                for email in cc:
-                    message.add_cc(Cc(email))
+                content.insert(0, {"type": "text/plain", "value": text})
             
-            if bcc:
-                for email in bcc:
-                    message.add_bcc(Bcc(email))
+            payload = {
+                "personalizations": [personalization],
+                "from": (
+                    {"email": from_email or self.default_from_email, "name": from_name or self.default_from_name}
+                    if from_email or from_name else self._default_from
+                ),
+                "subject": subject,
+                "content": content
+            }
+            if reply_to:
+                payload["reply_to"] = {"email": reply_to}
             
-            response = self.client.send(message)
+            response = await self._http.post(SENDGRID_SEND_PATH, json=payload)
             
             if response.status_code in [200, 201, 202]:
                 return EmailResult(success=True, message_id=response.headers.get('X-Message-Id'))
@@ -240,6 +283,10 @@ class SendGridEmailProvider(EmailProvider):
         except Exception as e:
             logger.error(f"SendGrid send failed: {e}")
             return EmailResult(success=False, error=str(e))
+    
+    async def aclose(self):
+        """Close the pooled HTTP client"""
+        await self._http.aclose()
 
 
 class AWSESEmailProvider(EmailProvider):
@@ -264,6 +311,7 @@ class AWSESEmailProvider(EmailProvider):
         
         self.default_from_email = os.environ.get('AWS_SES_FROM_EMAIL', 'noreply@mccareglobal.com')
         self.default_from_name = os.environ.get('AWS_SES_FROM_NAME', 'McCare Global ATS')
+        self._default_sender = f"{self.default_from_name} <{self.default_from_email}>"
         logger.info("AWSESEmailProvider initialized")
     
     @property
@@ -286,7 +334,10 @@ class AWSESEmailProvider(EmailProvider):
     ) -> EmailResult:
         """Send email via AWS SES"""
         try:
-            sender = f"{from_name or self.default_from_name} <{from_email or self.default_from_email}>"
+            if from_email or from_name:
+                sender = f"{from_name or self.default_from_name} <{from_email or self.default_from_email}>"
+            else:
+                sender = self._default_sender
             
             destination = {'ToAddresses': to}
             if cc:
@@ -298,7 +349,11 @@ class AWSESEmailProvider(EmailProvider):
             if text:
                 body['Text'] = {'Data': text, 'Charset': 'UTF-8'}
             
-            response = self.client.send_email(
+            # boto3 is synchronous; run it in the default thread pool so the
+            # event loop keeps serving requests while SES responds
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(None, functools.partial(
+                self.client.send_email,
                 Source=sender,
                 Destination=destination,
                 Message={
@@ -306,7 +361,7 @@ class AWSESEmailProvider(EmailProvider):
                     'Body': body
                 },
                 ReplyToAddresses=[reply_to] if reply_to else []
-            )
+            ))
             
             return EmailResult(success=True, message_id=response['MessageId'])
             
@@ -317,6 +372,17 @@ class AWSESEmailProvider(EmailProvider):
 
 # Provider singleton
 _email_provider: Optional[EmailProvider] = None
+_email_provider_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _select_provider_class() -> type:
+    """Pick the provider class from environment variables (evaluated once)"""
+    if os.environ.get('SENDGRID_API_KEY'):
+        return SendGridEmailProvider
+    if os.environ.get('AWS_SES_REGION') and os.environ.get('AWS_ACCESS_KEY_ID'):
+        return AWSESEmailProvider
+    return DemoEmailProvider
 
 
 def get_email_provider(db=None) -> EmailProvider:
@@ -339,16 +405,14 @@ def get_email_provider(db=None) -> EmailProvider:
     if _email_provider is not None:
         return _email_provider
     
-    # Check for production providers
-    if os.environ.get('SENDGRID_API_KEY'):
-        logger.info("Using SendGridEmailProvider")
-        _email_provider = SendGridEmailProvider()
-    elif os.environ.get('AWS_SES_REGION') and os.environ.get('AWS_ACCESS_KEY_ID'):
-        logger.info("Using AWSESEmailProvider")
-        _email_provider = AWSESEmailProvider()
-    else:
-        logger.info("Using DemoEmailProvider (no email credentials configured)")
-        _email_provider = DemoEmailProvider(db=db)
+    with _email_provider_lock:
+        if _email_provider is None:
+            provider_class = _select_provider_class()
+            logger.info(f"Using {provider_class.__name__}")
+            if provider_class is DemoEmailProvider:
+                _email_provider = DemoEmailProvider(db=db)
+            else:
+                _email_provider = provider_class()
     
     return _email_provider
 
@@ -357,3 +421,4 @@ def reset_email_provider():
     """Reset the email provider singleton (useful for testing)"""
     global _email_provider
     _email_provider = None
+    _select_provider_class.cache_clear()
@@ -0,0 +1,75 @@
+"""
+Email Template Rendering
+
+Compiles Jinja2 email templates once and reuses the compiled Template objects,
+so fan-out sends render each body without re-parsing the template source.
+
+Usage:
+    from email_templates import SplitTemplate, render_template
+
+    # Inline template strings (compiled once per distinct source)
+    html = render_template("<p>Hello {{ name }}</p>", name="Jane")
+
+    # Large templates with mostly constant markup
+    tmpl = SplitTemplate(EMAIL_HTML)
+    html = tmpl.render(name="Jane")
+"""
+
+from collections import OrderedDict
+import hashlib
+
+from jinja2 import Environment, Template, select_autoescape
+
+# Maximum number of distinct inline template sources kept compiled
+STRING_CACHE_SIZE = 256
+
+_env = Environment(autoescape=select_autoescape(default_for_string=True))
+
+# blake2b digest of source -> compiled Template, least recently used first
+_compiled: "OrderedDict[bytes, Template]" = OrderedDict()
+
+
+def compile_template(source: str) -> Template:
+    """Compile an inline template string, reusing the compiled form for repeated sources"""
+    key = hashlib.blake2b(source.encode("utf-8"), digest_size=16).digest()
+    template = _compiled.get(key)
+    if template is not None:
+        _compiled.move_to_end(key)
+        return template
+
+    template = _env.from_string(source)
+    _compiled[key] = template
+    if len(_compiled) > STRING_CACHE_SIZE:
+        _compiled.popitem(last=False)
+    return template
+
+
+def render_template(source: str, **context) -> str:
+    """Render an inline template string with the given context"""
+    return compile_template(source).render(**context)
+
+
+class SplitTemplate:
+    """
+    Template whose constant leading and trailing markup is kept as plain strings.
+
+    Everything before the first Jinja tag and after the last one (typically the
+    <head>/<style> block and the footer) is stored verbatim, and only the part
+    in between is compiled and rendered per call.
+    """
+
+    def __init__(self, source: str):
+        starts = [i for i in (source.find(d) for d in ("{{", "{%", "{#")) if i != -1]
+        ends = [i + 2 for i in (source.rfind(d) for d in ("}}", "%}", "#}")) if i != -1]
+        if not starts or not ends:
+            self.prefix, self.suffix, self._middle = source, "", None
+            return
+        start, end = min(starts), max(ends)
+        self.prefix = source[:start]
+        self.suffix = source[end:]
+        self._middle = compile_template(source[start:end])
+
+    def render(self, **context) -> str:
+        if self._middle is None:
+            return self.prefix
+        return "".join((self.prefix, self._middle.render(**context), self.suffix))
@@ -11,27 +11,34 @@ Safe: Yes - only adds new collections and fields
 Reversible: Yes
 """
 
+import asyncio
+
+from pymongo import IndexModel
+
 
 async def up(db):
     """Create notification collections and indexes"""
     
-    # Create indexes for notifications collection
-    await db.notifications.create_index("user_ids")
-    await db.notifications.create_index("created_at")
-    await db.notifications.create_index([("type", 1), ("created_at", -1)])
+    # The three operations touch disjoint collections, so run them concurrently
+    _, _, result = await asyncio.gather(
+        db.notifications.create_indexes([
+            IndexModel("user_ids"),
+            IndexModel("created_at"),
+            IndexModel([("type", 1), ("created_at", -1)]),
+        ]),
+        db.notification_logs.create_indexes([
+            IndexModel("created_at"),
+            IndexModel("type"),
+            IndexModel("status"),
+        ]),
+        # Add last_notified field to documents that don't have it
+        db.documents.update_many(
+            {"last_notified": {"$exists": False}},
+            {"$set": {"last_notified": {}}}
+        ),
+    )
     print("    Created notifications indexes")
-    
-    # Create indexes for notification_logs collection
-    await db.notification_logs.create_index("created_at")
-    await db.notification_logs.create_index("type")
-    await db.notification_logs.create_index("status")
     print("    Created notification_logs indexes")
-    
-    # Add last_notified field to documents that don't have it
-    result = await db.documents.update_many(
-        {"last_notified": {"$exists": False}},
-        {"$set": {"last_notified": {}}}
-    )
     print(f"    Updated {result.modified_count} documents with last_notified field")
 
 
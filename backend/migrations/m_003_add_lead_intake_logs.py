@@ -8,16 +8,20 @@ Safe: Yes - only adds new collection
 Reversible: Yes
 """
 
+from pymongo import IndexModel
+
 
 async def up(db):
     """Create lead_intake_logs collection and indexes"""
     
     # Create indexes for lead_intake_logs collection
-    await db.lead_intake_logs.create_index("created_at")
-    await db.lead_intake_logs.create_index("status")
-    await db.lead_intake_logs.create_index("form_id")
-    await db.lead_intake_logs.create_index("origin")
-    await db.lead_intake_logs.create_index([("created_at", -1), ("status", 1)])
+    await db.lead_intake_logs.create_indexes([
+        IndexModel("created_at"),
+        IndexModel("status"),
+        IndexModel("form_id"),
+        IndexModel("origin"),
+        IndexModel([("created_at", -1), ("status", 1)]),
+    ])
     print("    Created lead_intake_logs indexes")
 
 
@@ -11,42 +11,45 @@ Safe: Yes - only adds indexes and flags, doesn't delete data
 Reversible: Yes
 """
 
+from pymongo import IndexModel
+from pymongo.write_concern import WriteConcern
+
 
 async def up(db):
     """Fix orphan documents and add indexes for compliance queries"""
     
     # Create indexes for compliance queries
-    await db.documents.create_index([("candidate_id", 1), ("status", 1)])
-    await db.documents.create_index([("expiry_date", 1)])
-    await db.documents.create_index([("document_type", 1)])
+    await db.documents.create_indexes([
+        IndexModel([("candidate_id", 1), ("status", 1)]),
+        IndexModel([("expiry_date", 1)]),
+        IndexModel([("document_type", 1)]),
+    ])
     print("    Created compliance query indexes")
     
-    # Get all candidates for mapping
-    candidates = await db.candidates.find({}, {"_id": 0, "id": 1, "email": 1}).to_list(10000)
-    candidate_ids = {c["id"] for c in candidates}
-    email_to_id = {c["email"]: c["id"] for c in candidates if c.get("email")}
-    
-    # Find orphan documents
-    orphan_count = 0
-    fixed_count = 0
-    
-    documents = await db.documents.find({}, {"_id": 0}).to_list(10000)
-    
-    for doc in documents:
-        candidate_id = doc.get("candidate_id")
-        
-        # Check if candidate_id is missing or invalid
-        if not candidate_id or candidate_id not in candidate_ids:
-            orphan_count += 1
-            
-            # Flag as orphan
-            await db.documents.update_one(
-                {"id": doc["id"]},
-                {"$set": {"is_orphan": True, "orphan_reason": "Missing or invalid candidate_id"}}
-            )
+    # Flag orphans server-side: join each document to its candidate and merge
+    # the flag back into documents that have no match (requires MongoDB 4.4+)
+    pipeline = [
+        {"$lookup": {
+            "from": "candidates",
+            "localField": "candidate_id",
+            "foreignField": "id",
+            "as": "_c"
+        }},
+        {"$match": {"_c": {"$size": 0}}},
+        {"$project": {"_id": 1}},
+        {"$merge": {
+            "into": "documents",
+            "whenMatched": [{"$set": {"is_orphan": True, "orphan_reason": "Missing or invalid candidate_id"}}],
+            "whenNotMatched": "discard"
+        }}
+    ]
+    # The flags are re-derivable and the migration marker records completion,
+    # so skip waiting on the journal for the bulk flag write
+    documents = db.documents.with_options(write_concern=WriteConcern(w=1, j=False))
+    await documents.aggregate(pipeline).to_list(None)
     
+    orphan_count = await db.documents.count_documents({"is_orphan": True})
     print(f"    Found {orphan_count} orphan documents, flagged for review")
-    print(f"    Fixed {fixed_count} documents by email matching")
 
 
 async def down(db):
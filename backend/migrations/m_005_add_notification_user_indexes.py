@@ -0,0 +1,35 @@
+"""
+Migration 005: Add indexes for per-user notification queries
+
+The notification bell polls get_unread_count and get_user_notifications,
+which filter on user_ids and sort by created_at. A compound index serves
+both the filter and the sort; read_by is post-filtered from the index hits.
+Also enforces uniqueness of the notification id used by mark_as_read.
+
+Safe: Yes - only adds indexes
+Reversible: Yes
+"""
+
+from pymongo import IndexModel
+
+USER_FEED_INDEX = "user_ids_1_created_at_-1"
+ID_INDEX = "id_1"
+
+
+async def up(db):
+    """Create notification feed and id indexes"""
+    await db.notifications.create_indexes([
+        IndexModel([("user_ids", 1), ("created_at", -1)], name=USER_FEED_INDEX),
+        IndexModel([("id", 1)], name=ID_INDEX, unique=True),
+    ])
+    print("    Created notification feed and id indexes")
+
+
+async def down(db):
+    """Drop notification feed and id indexes"""
+    for name in (USER_FEED_INDEX, ID_INDEX):
+        try:
+            await db.notifications.drop_index(name)
+        except Exception as e:
+            print(f"    Warning: Could not drop index {name}: {e}")
+    print("    Dropped notification feed and id indexes")
@@ -0,0 +1,80 @@
+"""
+Migration 006: Add indexes for the core list and lookup queries
+
+The leads, candidates, job orders and users endpoints filter on a handful
+of fields and fetch single records by their `id`; without indexes every
+one of those requests is a collection scan.
+
+- Unique `id` indexes for every collection read with find_one({"id": ...})
+- leads: stage/recruiter filters sorted by created_at, plus email lookups
+  used by duplicate checks on public intake
+- candidates: the status/specialty/province/nurse_type filter set
+- job_orders: status/facility/specialty filters
+- users: unique email (login lookups and duplicate registration)
+
+Documents already have their compliance indexes from migration 004.
+
+Safe: Yes - only adds indexes (unique users.email fails if duplicates exist)
+Reversible: Yes
+"""
+
+import asyncio
+
+from pymongo import IndexModel
+
+ID_COLLECTIONS = (
+    "leads", "candidates", "documents", "facilities",
+    "job_orders", "assignments", "timesheets", "users",
+)
+
+QUERY_INDEXES = {
+    "leads": [
+        IndexModel([("stage", 1), ("created_at", -1)]),
+        IndexModel([("recruiter_id", 1), ("created_at", -1)]),
+        IndexModel([("created_at", -1)]),
+        IndexModel([("email", 1)]),
+    ],
+    "candidates": [
+        IndexModel([("status", 1), ("primary_specialty", 1), ("province", 1), ("nurse_type", 1)]),
+    ],
+    "job_orders": [
+        IndexModel([("status", 1), ("facility_id", 1), ("specialty", 1)]),
+        IndexModel([("facility_id", 1)]),
+    ],
+    "users": [
+        IndexModel([("email", 1)], unique=True),
+    ],
+}
+
+
+def _indexes():
+    """Yield (collection, IndexModel) for every index this migration owns"""
+    for collection in ID_COLLECTIONS:
+        yield collection, IndexModel([("id", 1)], unique=True)
+    for collection, models in QUERY_INDEXES.items():
+        for model in models:
+            yield collection, model
+
+
+async def up(db):
+    """Create id and query indexes"""
+    by_collection = {}
+    for collection, model in _indexes():
+        by_collection.setdefault(collection, []).append(model)
+
+    await asyncio.gather(*(
+        db[collection].create_indexes(models)
+        for collection, models in by_collection.items()
+    ))
+    print(f"    Created indexes on {len(by_collection)} collections")
+
+
+async def down(db):
+    """Drop id and query indexes"""
+    for collection, model in _indexes():
+        name = model.document["name"]
+        try:
+            await db[collection].drop_index(name)
+        except Exception as e:
+            print(f"    Warning: Could not drop index {collection}.{name}: {e}")
+    print("    Dropped core query indexes")
@@ -0,0 +1,37 @@
+"""
+Migration 007: Add created_at indexes for paged list endpoints
+
+Paged requests to the candidates, documents, facilities and job orders list
+endpoints are ordered by created_at (newest first). Indexing the sort key
+lets MongoDB walk the index for skip/limit instead of sorting in memory.
+Leads already have a created_at index from migration 006.
+
+Safe: Yes - only adds indexes
+Reversible: Yes
+"""
+
+import asyncio
+
+from pymongo import IndexModel
+
+COLLECTIONS = ("candidates", "documents", "facilities", "job_orders")
+CREATED_AT_INDEX = "created_at_-1"
+
+
+async def up(db):
+    """Create created_at indexes"""
+    await asyncio.gather(*(
+        db[collection].create_indexes([IndexModel([("created_at", -1)], name=CREATED_AT_INDEX)])
+        for collection in COLLECTIONS
+    ))
+    print(f"    Created created_at indexes on {', '.join(COLLECTIONS)}")
+
+
+async def down(db):
+    """Drop created_at indexes"""
+    for collection in COLLECTIONS:
+        try:
+            await db[collection].drop_index(CREATED_AT_INDEX)
+        except Exception as e:
+            print(f"    Warning: Could not drop index {collection}.{CREATED_AT_INDEX}: {e}")
+    print("    Dropped created_at indexes")
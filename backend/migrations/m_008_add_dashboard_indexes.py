@@ -0,0 +1,48 @@
+"""
+Migration 008: Add indexes for dashboard counts and billing queries
+
+get_dashboard_stats counts assignments by status and start_date window and
+timesheets by status; get_invoices reads approved timesheets by week. With
+these indexes each count is answered from the index instead of a scan.
+
+Candidate and job order status counts use the compound indexes from
+migration 006, and document expiry counts the expiry_date index from 004.
+
+Safe: Yes - only adds indexes
+Reversible: Yes
+"""
+
+import asyncio
+
+from pymongo import IndexModel
+
+INDEXES = {
+    "assignments": [
+        IndexModel([("status", 1)], name="status_1"),
+        IndexModel([("start_date", 1)], name="start_date_1"),
+    ],
+    "timesheets": [
+        IndexModel([("status", 1), ("week_start", 1)], name="status_1_week_start_1"),
+    ],
+}
+
+
+async def up(db):
+    """Create dashboard and billing indexes"""
+    await asyncio.gather(*(
+        db[collection].create_indexes(models)
+        for collection, models in INDEXES.items()
+    ))
+    print("    Created assignment and timesheet indexes")
+
+
+async def down(db):
+    """Drop dashboard and billing indexes"""
+    for collection, models in INDEXES.items():
+        for model in models:
+            name = model.document["name"]
+            try:
+                await db[collection].drop_index(name)
+            except Exception as e:
+                print(f"    Warning: Could not drop index {collection}.{name}: {e}")
+    print("    Dropped assignment and timesheet indexes")
@@ -0,0 +1,55 @@
+"""
+Migration 009: Add activity feed and credential warning indexes
+
+Covers the remaining lookups that still scan:
+
+- activities: unique `id`, and (entity_type, entity_id, created_at) for the
+  per-record activity feed, which filters on the entity and sorts newest first
+- documents: (candidate_id, expiry_date) for assignment credential warnings,
+  which read a candidate's documents expiring before the assignment ends
+
+The `id` indexes on the other collections (used by the shortlist and update
+endpoints) and the assignment, lead and candidate filter indexes already
+exist from migrations 006 and 008.
+
+Safe: Yes - only adds indexes (unique activities.id fails if duplicates exist)
+Reversible: Yes
+"""
+
+import asyncio
+
+from pymongo import IndexModel
+
+INDEXES = {
+    "activities": [
+        IndexModel([("id", 1)], name="id_1", unique=True),
+        IndexModel(
+            [("entity_type", 1), ("entity_id", 1), ("created_at", -1)],
+            name="entity_type_1_entity_id_1_created_at_-1",
+        ),
+    ],
+    "documents": [
+        IndexModel([("candidate_id", 1), ("expiry_date", 1)], name="candidate_id_1_expiry_date_1"),
+    ],
+}
+
+
+async def up(db):
+    """Create activity and credential warning indexes"""
+    await asyncio.gather(*(
+        db[collection].create_indexes(models)
+        for collection, models in INDEXES.items()
+    ))
+    print("    Created activity and document indexes")
+
+
+async def down(db):
+    """Drop activity and credential warning indexes"""
+    for collection, models in INDEXES.items():
+        for model in models:
+            name = model.document["name"]
+            try:
+                await db[collection].drop_index(name)
+            except Exception as e:
+                print(f"    Warning: Could not drop index {collection}.{name}: {e}")
+    print("    Dropped activity and document indexes")
@@ -0,0 +1,30 @@
+"""
+Migration 010: Add created_at index for the recent activity feed
+
+get_recent_activities reads the newest activities across all entities. The
+(entity_type, entity_id, created_at) index from migration 009 only helps
+when filtering by entity, so without this index every dashboard load sorts
+the whole activities collection.
+
+Safe: Yes - only adds an index
+Reversible: Yes
+"""
+
+from pymongo import IndexModel
+
+CREATED_AT_INDEX = "created_at_-1"
+
+
+async def up(db):
+    """Create activities created_at index"""
+    await db.activities.create_indexes([IndexModel([("created_at", -1)], name=CREATED_AT_INDEX)])
+    print("    Created activities created_at index")
+
+
+async def down(db):
+    """Drop activities created_at index"""
+    try:
+        await db.activities.drop_index(CREATED_AT_INDEX)
+    except Exception as e:
+        print(f"    Warning: Could not drop index activities.{CREATED_AT_INDEX}: {e}")
+    print("    Dropped activities created_at index")
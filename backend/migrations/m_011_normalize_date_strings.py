@@ -0,0 +1,41 @@
+"""
+Migration 011: Normalize stored credential and assignment dates to YYYY-MM-DD
+
+Dates are stored as ISO strings and compared as strings (credential warnings,
+expiring documents, dashboard windows), which is only correct when every
+value has the same format. Some documents were saved with a full timestamp
+("2025-03-01T00:00:00Z"), which sorts after the plain date "2025-03-01".
+
+Cuts those timestamps to their date part, the same part parse_expiry_date
+already reads. New writes are normalized by the API models.
+
+- documents.expiry_date
+- assignments.start_date, assignments.end_date
+
+Safe: Yes - values keep their date; anything not starting with an ISO date is untouched
+Reversible: No - the dropped time of day is not kept (it was never used)
+"""
+
+FIELDS = {
+    "documents": ("expiry_date",),
+    "assignments": ("start_date", "end_date"),
+}
+
+# A date followed by more characters, e.g. a time or timezone part
+TIMESTAMP_PATTERN = r"^\d{4}-\d{2}-\d{2}."
+
+
+async def up(db):
+    """Cut timestamp strings to their date part"""
+    for collection, fields in FIELDS.items():
+        for field in fields:
+            result = await db[collection].update_many(
+                {field: {"$regex": TIMESTAMP_PATTERN}},
+                [{"$set": {field: {"$substrBytes": [f"${field}", 0, 10]}}}]
+            )
+            print(f"    Normalized {result.modified_count} {collection}.{field} values")
+
+
+async def down(db):
+    """Nothing to restore; date-only values are valid input everywhere"""
+    print("    Date normalization is not reversible; no changes made")
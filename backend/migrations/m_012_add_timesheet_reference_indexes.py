@@ -0,0 +1,37 @@
+"""
+Migration 012: Add timesheet assignment and candidate indexes
+
+get_timesheets filters by assignment_id or candidate_id (a candidate's or
+an assignment's timesheets). Without indexes each filtered request is a
+collection scan.
+
+The activities (entity_type, entity_id, created_at) index already exists
+from migration 009.
+
+Safe: Yes - only adds indexes
+Reversible: Yes
+"""
+
+from pymongo import IndexModel
+
+INDEXES = [
+    IndexModel([("assignment_id", 1)], name="assignment_id_1"),
+    IndexModel([("candidate_id", 1)], name="candidate_id_1"),
+]
+
+
+async def up(db):
+    """Create timesheet reference indexes"""
+    await db.timesheets.create_indexes(INDEXES)
+    print("    Created timesheets assignment_id and candidate_id indexes")
+
+
+async def down(db):
+    """Drop timesheet reference indexes"""
+    for model in INDEXES:
+        name = model.document["name"]
+        try:
+            await db.timesheets.drop_index(name)
+        except Exception as e:
+            print(f"    Warning: Could not drop index timesheets.{name}: {e}")
+    print("    Dropped timesheet reference indexes")
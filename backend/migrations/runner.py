@@ -13,6 +13,7 @@ Usage:
 import asyncio
 import importlib
 import os
+import re
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
@@ -24,18 +25,32 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 load_dotenv(Path(__file__).parent.parent / '.env')
 
 MIGRATIONS_COLLECTION = "_migrations"
+MIGRATION_FILE_RE = re.compile(r"^m_(\d+)_(.+)$")  # m_001_name -> (001, name)
+
+
+_client: AsyncIOMotorClient = None
 
 
 async def get_db():
-    """Get database connection"""
-    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
-    return client[os.environ['DB_NAME']]
+    """Get database connection (one shared client per runner process)"""
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(os.environ['MONGO_URL'], maxPoolSize=50)
+    return _client[os.environ['DB_NAME']]
+
+
+def close_db():
+    """Close the shared client, if one was opened"""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
 
 
 async def get_executed_migrations(db) -> set:
     """Get set of already executed migration versions"""
-    executed = await db[MIGRATIONS_COLLECTION].find({}, {"version": 1}).to_list(1000)
-    return {m["version"] for m in executed}
+    cursor = db[MIGRATIONS_COLLECTION].find({}, {"_id": 0, "version": 1})
+    return {m["version"] async for m in cursor}
 
 
 async def mark_migration_executed(db, version: str, name: str, direction: str = "up"):
@@ -44,7 +59,7 @@ async def mark_migration_executed(db, version: str, name: str, direction: str =
         "version": version,
         "name": name,
         "direction": direction,
-        "executed_at": datetime.now(timezone.utc).isoformat()
+        "executed_at": datetime.now(timezone.utc)
     })
 
 
@@ -59,8 +74,10 @@ def discover_migrations() -> list:
     migrations = []
     
     for file in sorted(migrations_dir.glob("m_*.py")):
-        version = file.stem.split("_")[1]  # m_001_name -> 001
-        name = "_".join(file.stem.split("_")[2:])  # m_001_name -> name
+        match = MIGRATION_FILE_RE.match(file.stem)
+        if not match:
+            continue
+        version, name = match.groups()
         migrations.append({
             "version": version,
             "name": name,
@@ -83,6 +100,8 @@ async def run_migration(db, migration: dict, dry_run: bool = False):
     
     try:
         await module.up(db)
+        # Recorded before reporting success or starting the next migration, so
+        # a crash can never re-run a migration that already finished
         await mark_migration_executed(db, migration['version'], migration['name'])
         print(f"    ✓ Complete")
         return True
@@ -150,6 +169,14 @@ async def main():
     """Main entry point"""
     args = sys.argv[1:]
     
+    try:
+        await _dispatch(args)
+    finally:
+        close_db()
+
+
+async def _dispatch(args: list):
+    """Run the subcommand selected by the command-line arguments"""
     if "--list" in args:
         await list_migrations()
     elif "--dry-run" in args:
@@ -15,31 +15,71 @@ Usage:
     await service.check_expiring_credentials()
 """
 
+import asyncio
 import os
+import time
 import uuid
+from types import MappingProxyType
+from collections import defaultdict
 from datetime import datetime, timezone, timedelta
 from typing import List, Optional, Dict, Any
 import logging
+from pymongo import ReturnDocument, UpdateOne
 from email_provider import get_email_provider, EmailResult, reset_email_provider
+from email_templates import SplitTemplate
 
 logger = logging.getLogger(__name__)
 
+# Seconds to reuse notification settings before re-reading them from the database
+SETTINGS_CACHE_TTL = 30
 
-# Email templates
+# Notification settings seeded on first use (read-only; copied into the insert)
+DEFAULT_SETTINGS = MappingProxyType({
+    "enabled": True,
+    "sender_name": "McCare Global ATS",
+    "sender_email": "noreply@mccareglobal.com",
+    # New lead settings
+    "new_lead_enabled": True,
+    "new_lead_notify_owner": True,
+    "new_lead_fallback_emails": [],
+    # Expiring credential settings
+    "expiring_credential_enabled": True,
+    "expiring_thresholds": [60, 30, 14, 7],
+    "expired_alert_enabled": True,
+    "expiring_notify_compliance": True,
+    "expiring_notify_recruiter": True,
+    "expiring_notify_candidate": False,
+    "compliance_emails": [],
+    # Quiet hours (optional)
+    "quiet_hours_enabled": False,
+    "quiet_hours_start": "22:00",
+    "quiet_hours_end": "07:00"
+})
+
+# Maximum credential alerts processed at once during an expiry sweep
+ALERT_CONCURRENCY = 16
+
+# In-app notifications buffered before an insert_many is issued
+NOTIFICATION_BATCH_SIZE = 100
+
+MS_PER_DAY = 24 * 60 * 60 * 1000
+
+
+# Email templates (Jinja2 syntax, compiled once at import)
 NEW_LEAD_EMAIL_TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
     <style>
-        body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-        .header {{ background: #dc2626; color: white; padding: 20px; text-align: center; }}
-        .content {{ padding: 20px; background: #f9fafb; }}
-        .field {{ margin-bottom: 12px; }}
-        .label {{ font-weight: bold; color: #6b7280; font-size: 12px; text-transform: uppercase; }}
-        .value {{ font-size: 16px; color: #111827; }}
-        .button {{ display: inline-block; background: #dc2626; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin-top: 20px; }}
-        .footer {{ padding: 20px; text-align: center; color: #6b7280; font-size: 12px; }}
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: #dc2626; color: white; padding: 20px; text-align: center; }
+        .content { padding: 20px; background: #f9fafb; }
+        .field { margin-bottom: 12px; }
+        .label { font-weight: bold; color: #6b7280; font-size: 12px; text-transform: uppercase; }
+        .value { font-size: 16px; color: #111827; }
+        .button { display: inline-block; background: #dc2626; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin-top: 20px; }
+        .footer { padding: 20px; text-align: center; color: #6b7280; font-size: 12px; }
     </style>
 </head>
 <body>
@@ -52,44 +92,44 @@ NEW_LEAD_EMAIL_TEMPLATE = """
             
             <div class="field">
                 <div class="label">Name</div>
-                <div class="value">{first_name} {last_name}</div>
+                <div class="value">{{ first_name }} {{ last_name }}</div>
             </div>
             
             <div class="field">
                 <div class="label">Email</div>
-                <div class="value">{email}</div>
+                <div class="value">{{ email }}</div>
             </div>
             
             <div class="field">
                 <div class="label">Phone</div>
-                <div class="value">{phone}</div>
+                <div class="value">{{ phone }}</div>
             </div>
             
             <div class="field">
                 <div class="label">Specialty</div>
-                <div class="value">{specialty}</div>
+                <div class="value">{{ specialty }}</div>
             </div>
             
             <div class="field">
                 <div class="label">Province Preference</div>
-                <div class="value">{province}</div>
+                <div class="value">{{ province }}</div>
             </div>
             
             <div class="field">
                 <div class="label">Source</div>
-                <div class="value">{source}</div>
+                <div class="value">{{ source }}</div>
             </div>
             
             <div class="field">
                 <div class="label">Assigned To</div>
-                <div class="value">{owner_name}</div>
+                <div class="value">{{ owner_name }}</div>
             </div>
             
-            <a href="{lead_url}" class="button">View Lead Details</a>
+            <a href="{{ lead_url }}" class="button">View Lead Details</a>
         </div>
         <div class="footer">
             <p>This is an automated notification from McCare Global ATS.</p>
-            <p>© {year} McCare Global Healthcare Services Inc.</p>
+            <p>© {{ year }} McCare Global Healthcare Services Inc.</p>
         </div>
     </div>
 </body>
@@ -101,62 +141,157 @@ EXPIRING_CREDENTIAL_EMAIL_TEMPLATE = """
 <html>
 <head>
     <style>
-        body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-        .header {{ background: {header_color}; color: white; padding: 20px; text-align: center; }}
-        .content {{ padding: 20px; background: #f9fafb; }}
-        .alert-box {{ background: {alert_bg}; border-left: 4px solid {alert_border}; padding: 15px; margin-bottom: 20px; }}
-        .field {{ margin-bottom: 12px; }}
-        .label {{ font-weight: bold; color: #6b7280; font-size: 12px; text-transform: uppercase; }}
-        .value {{ font-size: 16px; color: #111827; }}
-        .days-remaining {{ font-size: 24px; font-weight: bold; color: {days_color}; }}
-        .button {{ display: inline-block; background: #dc2626; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin-top: 20px; }}
-        .footer {{ padding: 20px; text-align: center; color: #6b7280; font-size: 12px; }}
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { color: white; padding: 20px; text-align: center; }
+        .content { padding: 20px; background: #f9fafb; }
+        .alert-box { padding: 15px; margin-bottom: 20px; }
+        .field { margin-bottom: 12px; }
+        .label { font-weight: bold; color: #6b7280; font-size: 12px; text-transform: uppercase; }
+        .value { font-size: 16px; color: #111827; }
+        .days-remaining { font-size: 24px; font-weight: bold; }
+        .button { display: inline-block; background: #dc2626; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin-top: 20px; }
+        .footer { padding: 20px; text-align: center; color: #6b7280; font-size: 12px; }
     </style>
 </head>
 <body>
     <div class="container">
-        <div class="header">
-            <h1 style="margin:0;">{alert_title}</h1>
+        <div class="header" style="background: {{ header_color }};">
+            <h1 style="margin:0;">{{ alert_title }}</h1>
         </div>
         <div class="content">
-            <div class="alert-box">
-                <p style="margin:0;"><strong>{document_type}</strong> for <strong>{candidate_name}</strong></p>
-                <p style="margin:5px 0 0 0;">Expires: {expiry_date}</p>
-                <p class="days-remaining">{days_text}</p>
+            <div class="alert-box" style="background: {{ alert_bg }}; border-left: 4px solid {{ alert_border }};">
+                <p style="margin:0;"><strong>{{ document_type }}</strong> for <strong>{{ candidate_name }}</strong></p>
+                <p style="margin:5px 0 0 0;">Expires: {{ expiry_date }}</p>
+                <p class="days-remaining" style="color: {{ days_color }};">{{ days_text }}</p>
             </div>
             
             <div class="field">
                 <div class="label">Candidate</div>
-                <div class="value">{candidate_name}</div>
+                <div class="value">{{ candidate_name }}</div>
             </div>
             
             <div class="field">
                 <div class="label">Document Type</div>
-                <div class="value">{document_type}</div>
+                <div class="value">{{ document_type }}</div>
             </div>
             
             <div class="field">
                 <div class="label">Expiry Date</div>
-                <div class="value">{expiry_date}</div>
+                <div class="value">{{ expiry_date }}</div>
             </div>
             
             <div class="field">
                 <div class="label">Status</div>
-                <div class="value">{current_status}</div>
+                <div class="value">{{ current_status }}</div>
             </div>
             
-            <a href="{candidate_url}" class="button">View Candidate Documents</a>
+            <a href="{{ candidate_url }}" class="button">View Candidate Documents</a>
         </div>
         <div class="footer">
             <p>This is an automated compliance alert from McCare Global ATS.</p>
-            <p>© {year} McCare Global Healthcare Services Inc.</p>
+            <p>© {{ year }} McCare Global Healthcare Services Inc.</p>
         </div>
     </div>
 </body>
 </html>
 """
 
+CREDENTIAL_DIGEST_EMAIL_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: #991b1b; color: white; padding: 20px; text-align: center; }
+        .content { padding: 20px; background: #f9fafb; }
+        .alert-box { padding: 15px; margin-bottom: 16px; }
+        .alert-title { font-weight: bold; font-size: 12px; text-transform: uppercase; }
+        .days-remaining { font-size: 18px; font-weight: bold; }
+        .link { color: #dc2626; }
+        .footer { padding: 20px; text-align: center; color: #6b7280; font-size: 12px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1 style="margin:0;">Credential Alerts ({{ count }})</h1>
+        </div>
+        <div class="content">
+            <p>The following credentials need attention:</p>
+            {% for alert in alerts %}
+            <div class="alert-box" style="background: {{ alert.style.alert_bg }}; border-left: 4px solid {{ alert.style.alert_border }};">
+                <div class="alert-title" style="color: {{ alert.style.header_color }};">{{ alert.style.alert_title }}</div>
+                <p style="margin:0;"><strong>{{ alert.document_type }}</strong> for <strong>{{ alert.candidate_name }}</strong></p>
+                <p style="margin:5px 0 0 0;">Expires: {{ alert.expiry_date }} &middot; Status: {{ alert.current_status }}</p>
+                <p class="days-remaining" style="margin:5px 0 0 0; color: {{ alert.style.days_color }};">{{ alert.days_text }}</p>
+                <a href="{{ alert.candidate_url }}" class="link">View Candidate Documents</a>
+            </div>
+            {% endfor %}
+        </div>
+        <div class="footer">
+            <p>This is an automated compliance alert from McCare Global ATS.</p>
+            <p>© {{ year }} McCare Global Healthcare Services Inc.</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+# Only the variable middle of each template is rendered per email; the constant
+# head and footer markup is concatenated as-is
+_NEW_LEAD_TMPL = SplitTemplate(NEW_LEAD_EMAIL_TEMPLATE)
+_EXPIRING_CREDENTIAL_TMPL = SplitTemplate(EXPIRING_CREDENTIAL_EMAIL_TEMPLATE)
+_CREDENTIAL_DIGEST_TMPL = SplitTemplate(CREDENTIAL_DIGEST_EMAIL_TEMPLATE)
+
+
+# Credential alert styling by urgency
+EXPIRED_ALERT_STYLE = {
+    "alert_title": "EXPIRED Credential Alert",
+    "header_color": "#991b1b",
+    "alert_bg": "#fef2f2",
+    "alert_border": "#dc2626",
+    "days_color": "#dc2626",
+    "priority": "urgent"
+}
+
+# (max days until expiry, style), checked in order
+ALERT_BANDS = [
+    (7, {
+        "alert_title": "URGENT: Credential Expiring Soon",
+        "header_color": "#dc2626",
+        "alert_bg": "#fef2f2",
+        "alert_border": "#dc2626",
+        "days_color": "#dc2626",
+        "priority": "high"
+    }),
+    (14, {
+        "alert_title": "Credential Expiring Soon",
+        "header_color": "#d97706",
+        "alert_bg": "#fffbeb",
+        "alert_border": "#f59e0b",
+        "days_color": "#d97706",
+        "priority": "high"
+    }),
+    (30, {
+        "alert_title": "Credential Expiring",
+        "header_color": "#d97706",
+        "alert_bg": "#fffbeb",
+        "alert_border": "#f59e0b",
+        "days_color": "#d97706",
+        "priority": "normal"
+    }),
+    (float("inf"), {
+        "alert_title": "Credential Expiry Notice",
+        "header_color": "#0284c7",
+        "alert_bg": "#f0f9ff",
+        "alert_border": "#0ea5e9",
+        "days_color": "#0284c7",
+        "priority": "low"
+    })
+]
+
 
 class NotificationService:
     """Service for managing notifications and email alerts"""
@@ -175,43 +310,44 @@ class NotificationService:
         from email_provider import reset_email_provider
         reset_email_provider()  # Reset singleton to pick up db
         self.email_provider = get_email_provider(db)
+        # (settings, fetched_at monotonic time); settings change rarely
+        self._settings_cache: Optional[tuple] = None
+        self._notification_buffer: List[dict] = []
+        # Background email sends still in flight
+        self._pending_emails = set()
     
     async def get_settings(self) -> dict:
-        """Get notification settings from database"""
+        """Get notification settings (cached for SETTINGS_CACHE_TTL seconds)"""
+        if self._settings_cache is not None:
+            cached, fetched_at = self._settings_cache
+            if time.monotonic() - fetched_at < SETTINGS_CACHE_TTL:
+                return cached
+        
         settings = await self.db.notification_settings.find_one({}, {"_id": 0})
         if not settings:
-            # Default settings
-            settings = {
-                "id": str(uuid.uuid4()),
-                "enabled": True,
-                "sender_name": "McCare Global ATS",
-                "sender_email": "noreply@mccareglobal.com",
-                # New lead settings
-                "new_lead_enabled": True,
-                "new_lead_notify_owner": True,
-                "new_lead_fallback_emails": [],
-                # Expiring credential settings
-                "expiring_credential_enabled": True,
-                "expiring_thresholds": [60, 30, 14, 7],
-                "expired_alert_enabled": True,
-                "expiring_notify_compliance": True,
-                "expiring_notify_recruiter": True,
-                "expiring_notify_candidate": False,
-                "compliance_emails": [],
-                # Quiet hours (optional)
-                "quiet_hours_enabled": False,
-                "quiet_hours_start": "22:00",
-                "quiet_hours_end": "07:00",
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat()
-            }
-            await self.db.notification_settings.insert_one(settings)
+            # Seed defaults atomically so concurrent workers can't insert duplicates
+            now_iso = datetime.now(timezone.utc).isoformat()
+            settings = await self.db.notification_settings.find_one_and_update(
+                {},
+                {"$setOnInsert": {
+                    **DEFAULT_SETTINGS,
+                    "id": str(uuid.uuid4()),
+                    "created_at": now_iso,
+                    "updated_at": now_iso
+                }},
+                projection={"_id": 0},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        
+        self._settings_cache = (settings, time.monotonic())
         return settings
     
     async def update_settings(self, updates: dict) -> dict:
         """Update notification settings"""
         updates["updated_at"] = datetime.now(timezone.utc).isoformat()
         await self.db.notification_settings.update_one({}, {"$set": updates}, upsert=True)
+        self._settings_cache = None
         return await self.get_settings()
     
     async def create_notification(
@@ -223,7 +359,8 @@ class NotificationService:
         entity_type: str = None,
         entity_id: str = None,
         priority: str = "normal",
-        metadata: dict = None
+        metadata: dict = None,
+        created_at: str = None
     ) -> dict:
         """
         Create an in-app notification.
@@ -237,7 +374,12 @@ class NotificationService:
             entity_id: Related entity ID
             priority: Priority level (low, normal, high, urgent)
             metadata: Additional metadata
+            created_at: ISO timestamp to use (lets batch callers share one)
             
+        Notifications are buffered and written with insert_many once
+        NOTIFICATION_BATCH_SIZE accumulate; callers flush the rest with
+        _flush_notifications() when they finish.
+        
         Returns:
             Created notification document
         """
@@ -252,14 +394,24 @@ class NotificationService:
             "priority": priority,
             "metadata": metadata or {},
             "read_by": [],
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": created_at or datetime.now(timezone.utc).isoformat()
         }
         
-        await self.db.notifications.insert_one(notification)
-        logger.info(f"Created notification: {notification['id']} - {title}")
+        self._notification_buffer.append(notification)
+        if len(self._notification_buffer) >= NOTIFICATION_BATCH_SIZE:
+            await self._flush_notifications()
+        logger.info("Created notification: %s - %s", notification["id"], title)
         
         return notification
     
+    async def _flush_notifications(self):
+        """Write all buffered notifications in a single insert_many"""
+        if not self._notification_buffer:
+            return
+        # Swap the buffer out first so concurrent creators start a fresh batch
+        batch, self._notification_buffer = self._notification_buffer, []
+        await self.db.notifications.insert_many(batch, ordered=False)
+    
     async def get_user_notifications(
         self,
         user_id: str,
@@ -313,7 +465,7 @@ class NotificationService:
             created_by_user: User who created the lead (if internal)
             
         Returns:
-            True if notifications sent successfully
+            True if notifications were created (the email is sent in the background)
         """
         settings = await self.get_settings()
         
@@ -321,9 +473,11 @@ class NotificationService:
             logger.info("New lead notifications disabled")
             return False
         
-        # Determine recipients
+        # Determine recipients (sets track membership, lists keep order)
         recipients = []
         recipient_emails = []
+        seen_ids = set()
+        seen_emails = set()
         owner_name = "Unassigned"
         
         # Get lead owner if assigned
@@ -335,6 +489,8 @@ class NotificationService:
             if owner:
                 recipients.append(owner["id"])
                 recipient_emails.append(owner["email"])
+                seen_ids.add(owner["id"])
+                seen_emails.add(owner["email"])
                 owner_name = f"{owner['first_name']} {owner['last_name']}"
         
         # Add fallback admins if no owner or always include
@@ -346,14 +502,17 @@ class NotificationService:
             ).to_list(100)
             
             for admin in admins:
-                if admin["id"] not in recipients:
+                if admin["id"] not in seen_ids:
+                    seen_ids.add(admin["id"])
                     recipients.append(admin["id"])
-                if admin["email"] not in recipient_emails:
+                if admin["email"] not in seen_emails:
+                    seen_emails.add(admin["email"])
                     recipient_emails.append(admin["email"])
             
             # Add configured fallback emails
             for email in settings.get("new_lead_fallback_emails", []):
-                if email not in recipient_emails:
+                if email not in seen_emails:
+                    seen_emails.add(email)
                     recipient_emails.append(email)
         
         if not recipients:
@@ -375,12 +534,13 @@ class NotificationService:
                 "email": lead.get("email")
             }
         )
+        await self._flush_notifications()
         
         # Send email notification
         if recipient_emails:
             lead_url = f"{self.base_url}/leads"
             
-            html = NEW_LEAD_EMAIL_TEMPLATE.format(
+            html = _NEW_LEAD_TMPL.render(
                 first_name=lead.get("first_name", ""),
                 last_name=lead.get("last_name", ""),
                 email=lead.get("email", "N/A"),
@@ -393,7 +553,8 @@ class NotificationService:
                 year=datetime.now().year
             )
             
-            result = await self.email_provider.send_email(
+            # Send in the background so lead intake doesn't wait on the provider
+            self._dispatch_email(
                 to=recipient_emails,
                 subject=f"New Lead: {lead.get('first_name')} {lead.get('last_name')} – {lead.get('specialty', 'Healthcare')}",
                 html=html,
@@ -401,11 +562,33 @@ class NotificationService:
                 from_email=settings.get("sender_email"),
                 metadata={"notification_type": "new_lead", "lead_id": lead.get("id")}
             )
-            
-            return result.success
         
         return True
     
+    def _dispatch_email(self, **kwargs):
+        """Send an email in a background task, keeping a reference until it finishes"""
+        task = asyncio.create_task(self._send_email_safely(**kwargs))
+        self._pending_emails.add(task)
+        task.add_done_callback(self._pending_emails.discard)
+    
+    async def _send_email_safely(self, **kwargs) -> bool:
+        """Send an email, logging rather than raising on failure"""
+        try:
+            result = await self.email_provider.send_email(**kwargs)
+        except Exception as e:
+            logger.error("Background email send failed: %s", e)
+            return False
+        if not result.success:
+            logger.error("Background email send failed: %s", result.error)
+        return result.success
+    
+    async def aclose(self):
+        """Wait for background emails to finish and release provider resources"""
+        if self._pending_emails:
+            await asyncio.gather(*self._pending_emails, return_exceptions=True)
+        await self._flush_notifications()
+        await self.email_provider.aclose()
+    
     async def check_expiring_credentials(self) -> dict:
         """
         Check for expiring credentials and send notifications.
@@ -422,115 +605,225 @@ class NotificationService:
             return {"status": "disabled", "notifications_sent": 0}
         
         thresholds = settings.get("expiring_thresholds", [60, 30, 14, 7])
-        today = datetime.now(timezone.utc).date()
+        # Sorted once per sweep, largest first, with their last_notified keys
+        threshold_keys = tuple((t, f"threshold_{t}") for t in sorted(thresholds, reverse=True))
+        # One timestamp for the whole sweep
+        now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
+        today = now.date()
         
         summary = {
             "status": "completed",
-            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "checked_at": now_iso,
             "documents_checked": 0,
             "notifications_sent": 0,
             "emails_sent": 0,
             "by_threshold": {}
         }
         
-        # Get all documents with expiry dates
-        documents = await self.db.documents.find(
-            {"expiry_date": {"$ne": None}},
-            {"_id": 0}
-        ).to_list(10000)
+        # Only fetch documents that can produce an alert: expiring within the
+        # largest threshold and either not yet notified or already expired.
+        # expiry_date is an ISO string, so date prefixes compare correctly.
+        cutoff = (today + timedelta(days=max(thresholds, default=0) + 1)).isoformat()
+        actionable = [{f"last_notified.{key}": {"$exists": False}} for _, key in threshold_keys]
+        if settings.get("expired_alert_enabled"):
+            actionable.append({"expiry_date": {"$lt": today.isoformat()}})
+        
+        # Days until expiry are computed by Mongo from the date part of the
+        # stored string, so no per-document parsing happens in Python
+        today_start = datetime(today.year, today.month, today.day, tzinfo=timezone.utc)
+        pipeline = [
+            {"$match": {"expiry_date": {"$ne": None, "$lt": cutoff}, "$or": actionable}},
+            {"$addFields": {"days_until": {"$toInt": {"$divide": [
+                {"$subtract": [
+                    {"$dateFromString": {
+                        "dateString": {"$substrBytes": ["$expiry_date", 0, 10]},
+                        "format": "%Y-%m-%d",
+                        "onError": None
+                    }},
+                    today_start
+                ]},
+                MS_PER_DAY
+            ]}}}},
+            # Join each document to its candidate in the same round trip
+            {"$lookup": {
+                "from": "candidates",
+                "localField": "candidate_id",
+                "foreignField": "id",
+                "as": "candidate"
+            }},
+            {"$unwind": {"path": "$candidate", "preserveNullAndEmptyArrays": True}},
+            # Only the fields the alert needs
+            {"$project": {
+                "_id": 0,
+                "id": 1,
+                "expiry_date": 1,
+                "candidate_id": 1,
+                "document_type": 1,
+                "status": 1,
+                "last_notified": 1,
+                "days_until": 1,
+                "candidate.id": 1,
+                "candidate.first_name": 1,
+                "candidate.last_name": 1,
+                "candidate.email": 1
+            }}
+        ]
+        
+        # Look up recipients once for the whole sweep
+        compliance_users = []
+        if settings.get("expiring_notify_compliance"):
+            compliance_users = await self.db.users.find(
+                {"role": {"$in": ["Admin", "Compliance Officer"]}},
+                {"_id": 0, "id": 1, "email": 1}
+            ).to_list(100)
         
-        summary["documents_checked"] = len(documents)
+        last_notified_updates = []
+        # Alerts grouped by recipient list; each group is emailed as one digest
+        email_buckets = defaultdict(list)
         
-        for doc in documents:
+        async def process(doc: dict):
+            """Queue the alert for one document, if it is due, in its recipients' digest"""
+            expiry_str = doc.get("expiry_date")
+            if not expiry_str:
+                return
+            
+            days_until_expiry = doc.pop("days_until", None)
+            if days_until_expiry is None:
+                raise ValueError(f"Invalid expiry_date: {expiry_str!r}")
+            
+            candidate = doc.pop("candidate", None)
+            
+            # Check if already expired
+            if days_until_expiry < 0 and settings.get("expired_alert_enabled"):
+                await self._send_credential_alert(
+                    doc, candidate, days_until_expiry, "expired", settings, compliance_users,
+                    now_iso=now_iso, year=now.year, email_buckets=email_buckets
+                )
+                return
+            
+            # Check thresholds
+            for threshold, threshold_key in threshold_keys:
+                if days_until_expiry <= threshold:
+                    # Check if already notified for this threshold
+                    last_notified = doc.get("last_notified", {})
+                    
+                    if threshold_key not in last_notified:
+                        await self._send_credential_alert(
+                            doc, candidate, days_until_expiry, threshold, settings, compliance_users,
+                            now_iso=now_iso, year=now.year, email_buckets=email_buckets
+                        )
+                    break  # Only alert for the nearest threshold
+        
+        # Alerts are independent, so send them concurrently with a bounded fan-out.
+        # The semaphore is taken before each task starts, so at most
+        # ALERT_CONCURRENCY streamed documents are held in memory at once.
+        semaphore = asyncio.Semaphore(ALERT_CONCURRENCY)
+        in_flight = set()
+        
+        async def send_digest(recipient_emails: frozenset, alerts: List[dict]):
             try:
-                expiry_str = doc.get("expiry_date")
-                if not expiry_str:
-                    continue
-                
-                # Parse expiry date
-                if "T" in expiry_str:
-                    expiry_date = datetime.fromisoformat(expiry_str.replace("Z", "+00:00")).date()
-                else:
-                    expiry_date = datetime.strptime(expiry_str, "%Y-%m-%d").date()
-                
-                days_until_expiry = (expiry_date - today).days
-                
-                # Check if already expired
-                if days_until_expiry < 0 and settings.get("expired_alert_enabled"):
-                    await self._send_credential_alert(doc, days_until_expiry, "expired", settings)
-                    summary["notifications_sent"] += 1
-                    continue
-                
-                # Check thresholds
-                for threshold in sorted(thresholds, reverse=True):
-                    if days_until_expiry <= threshold:
-                        # Check if already notified for this threshold
-                        last_notified = doc.get("last_notified", {})
-                        threshold_key = f"threshold_{threshold}"
-                        
-                        if threshold_key not in last_notified:
-                            # Send notification
-                            sent = await self._send_credential_alert(doc, days_until_expiry, threshold, settings)
-                            if sent:
-                                # Update last notified
-                                await self.db.documents.update_one(
-                                    {"id": doc["id"]},
-                                    {"$set": {f"last_notified.{threshold_key}": datetime.now(timezone.utc).isoformat()}}
-                                )
-                                summary["notifications_sent"] += 1
-                                summary["by_threshold"][str(threshold)] = summary["by_threshold"].get(str(threshold), 0) + 1
-                        break  # Only alert for the nearest threshold
-                        
+                sent = await self._send_alert_email(sorted(recipient_emails), alerts, settings, now.year)
             except Exception as e:
-                logger.error(f"Error processing document {doc.get('id')}: {e}")
-        
-        logger.info(f"Credential check complete: {summary}")
+                logger.error("Error sending credential digest to %d recipient(s): %s", len(recipient_emails), e)
+                return
+            if not sent:
+                return
+            # Alerts are counted, and thresholds marked as notified, only once
+            # the email carrying them went out
+            summary["emails_sent"] += 1
+            summary["notifications_sent"] += len(alerts)
+            for alert in alerts:
+                threshold = alert["threshold"]
+                if threshold != "expired":
+                    summary["by_threshold"][str(threshold)] = summary["by_threshold"].get(str(threshold), 0) + 1
+                    last_notified_updates.append(UpdateOne(
+                        {"id": alert["document_id"]},
+                        {"$set": {f"last_notified.threshold_{threshold}": now_iso}}
+                    ))
+        
+        async def bounded(doc: dict):
+            try:
+                await process(doc)
+            except Exception as e:
+                logger.error("Error processing document %s: %s", doc.get("id"), e)
+            finally:
+                semaphore.release()
+        
+        try:
+            if actionable:
+                async for doc in self.db.documents.aggregate(pipeline):
+                    summary["documents_checked"] += 1
+                    await semaphore.acquire()
+                    task = asyncio.create_task(bounded(doc))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+        finally:
+            # Let started alerts finish before writing their results
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+            if email_buckets:
+                await asyncio.gather(*(
+                    send_digest(recipient_emails, alerts)
+                    for recipient_emails, alerts in email_buckets.items()
+                ))
+            await self._flush_notifications()
+            if last_notified_updates:
+                await self.db.documents.bulk_write(last_notified_updates, ordered=False)
+        
+        logger.info("Credential check complete: %s", summary)
         return summary
     
     async def _send_credential_alert(
         self,
         document: dict,
+        candidate: Optional[dict],
         days_until_expiry: int,
         threshold: int | str,
-        settings: dict
+        settings: dict,
+        compliance_users: List[dict],
+        now_iso: str = None,
+        year: int = None,
+        email_buckets: Optional[Dict[frozenset, List[dict]]] = None
     ) -> bool:
-        """Send alert for expiring/expired credential"""
+        """
+        Send alert for expiring/expired credential.
         
-        # Get candidate info
-        candidate = await self.db.candidates.find_one(
-            {"id": document.get("candidate_id")},
-            {"_id": 0, "id": 1, "first_name": 1, "last_name": 1, "email": 1}
-        )
+        The candidate (joined in the sweep aggregation) and compliance users
+        are supplied by check_expiring_credentials, along with the sweep's shared
+        timestamp and year. When email_buckets is given, the email is not sent
+        here; the alert is added to the bucket for its recipient list so the
+        caller can send one digest per bucket, and True only means it was queued.
+        """
         
         if not candidate:
-            logger.warning(f"Candidate not found for document {document.get('id')}")
+            logger.warning("Candidate not found for document %s", document.get("id"))
             return False
         
         candidate_name = f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}"
         
-        # Determine recipients
+        # Determine recipients (sets track membership, lists keep order)
         recipients = []
         recipient_emails = []
+        seen_emails = set()
         
-        # Get compliance users
+        # Compliance users
         if settings.get("expiring_notify_compliance"):
-            compliance_users = await self.db.users.find(
-                {"role": {"$in": ["Admin", "Compliance Officer"]}},
-                {"_id": 0, "id": 1, "email": 1}
-            ).to_list(100)
-            
             for user in compliance_users:
                 recipients.append(user["id"])
                 recipient_emails.append(user["email"])
+                seen_emails.add(user["email"])
             
             # Add configured compliance emails
             for email in settings.get("compliance_emails", []):
-                if email not in recipient_emails:
+                if email not in seen_emails:
+                    seen_emails.add(email)
                     recipient_emails.append(email)
         
         # Optionally notify candidate
         if settings.get("expiring_notify_candidate") and candidate.get("email"):
-            if candidate["email"] not in recipient_emails:
+            if candidate["email"] not in seen_emails:
+                seen_emails.add(candidate["email"])
                 recipient_emails.append(candidate["email"])
         
         if not recipients:
@@ -540,45 +833,12 @@ class NotificationService:
         # Determine alert styling based on urgency
         is_expired = threshold == "expired"
         if is_expired:
-            alert_title = "EXPIRED Credential Alert"
+            style = EXPIRED_ALERT_STYLE
             days_text = f"EXPIRED {abs(days_until_expiry)} days ago"
-            header_color = "#991b1b"
-            alert_bg = "#fef2f2"
-            alert_border = "#dc2626"
-            days_color = "#dc2626"
-            priority = "urgent"
-        elif days_until_expiry <= 7:
-            alert_title = "URGENT: Credential Expiring Soon"
-            days_text = f"{days_until_expiry} days remaining"
-            header_color = "#dc2626"
-            alert_bg = "#fef2f2"
-            alert_border = "#dc2626"
-            days_color = "#dc2626"
-            priority = "high"
-        elif days_until_expiry <= 14:
-            alert_title = "Credential Expiring Soon"
-            days_text = f"{days_until_expiry} days remaining"
-            header_color = "#d97706"
-            alert_bg = "#fffbeb"
-            alert_border = "#f59e0b"
-            days_color = "#d97706"
-            priority = "high"
-        elif days_until_expiry <= 30:
-            alert_title = "Credential Expiring"
-            days_text = f"{days_until_expiry} days remaining"
-            header_color = "#d97706"
-            alert_bg = "#fffbeb"
-            alert_border = "#f59e0b"
-            days_color = "#d97706"
-            priority = "normal"
         else:
-            alert_title = "Credential Expiry Notice"
+            style = next(band_style for limit, band_style in ALERT_BANDS if days_until_expiry <= limit)
             days_text = f"{days_until_expiry} days remaining"
-            header_color = "#0284c7"
-            alert_bg = "#f0f9ff"
-            alert_border = "#0ea5e9"
-            days_color = "#0284c7"
-            priority = "low"
+        alert_title = style["alert_title"]
         
         # Create in-app notification
         await self.create_notification(
@@ -588,7 +848,8 @@ class NotificationService:
             user_ids=recipients,
             entity_type="document",
             entity_id=document.get("id"),
-            priority=priority,
+            priority=style["priority"],
+            created_at=now_iso,
             metadata={
                 "candidate_id": candidate.get("id"),
                 "candidate_name": candidate_name,
@@ -598,36 +859,61 @@ class NotificationService:
             }
         )
         
-        # Send email
-        candidate_url = f"{self.base_url}/candidates/{candidate.get('id')}"
-        
-        html = EXPIRING_CREDENTIAL_EMAIL_TEMPLATE.format(
-            alert_title=alert_title,
-            document_type=document.get("document_type", "Document"),
-            candidate_name=candidate_name,
-            expiry_date=document.get("expiry_date", "N/A"),
-            days_text=days_text,
-            current_status=document.get("status", "Unknown"),
-            candidate_url=candidate_url,
-            header_color=header_color,
-            alert_bg=alert_bg,
-            alert_border=alert_border,
-            days_color=days_color,
-            year=datetime.now().year
-        )
+        alert = {
+            "document_id": document.get("id"),
+            "candidate_id": candidate.get("id"),
+            "candidate_name": candidate_name,
+            "document_type": document.get("document_type", "Document"),
+            "expiry_date": document.get("expiry_date", "N/A"),
+            "current_status": document.get("status", "Unknown"),
+            "days_text": days_text,
+            "candidate_url": f"{self.base_url}/candidates/{candidate.get('id')}",
+            "threshold": threshold,
+            "style": style
+        }
+        
+        if email_buckets is not None:
+            email_buckets[frozenset(recipient_emails)].append(alert)
+            return True
+        
+        return await self._send_alert_email(recipient_emails, [alert], settings, year)
+    
+    async def _send_alert_email(
+        self,
+        recipient_emails: List[str],
+        alerts: List[dict],
+        settings: dict,
+        year: int = None
+    ) -> bool:
+        """Email one credential alert, or a digest when there are several"""
+        year = year or datetime.now().year
+        
+        if len(alerts) == 1:
+            alert = alerts[0]
+            html = _EXPIRING_CREDENTIAL_TMPL.render(**alert["style"], **alert, year=year)
+            subject = f"{alert['style']['alert_title']}: {alert['document_type']} - {alert['candidate_name']}"
+            metadata = {
+                "notification_type": "expiring_credential",
+                "document_id": alert["document_id"],
+                "candidate_id": alert["candidate_id"],
+                "threshold": alert["threshold"]
+            }
+        else:
+            html = _CREDENTIAL_DIGEST_TMPL.render(alerts=alerts, count=len(alerts), year=year)
+            subject = f"Credential Alerts: {len(alerts)} documents need attention"
+            metadata = {
+                "notification_type": "expiring_credential",
+                "document_ids": [alert["document_id"] for alert in alerts],
+                "digest": True
+            }
         
         result = await self.email_provider.send_email(
             to=recipient_emails,
-            subject=f"{alert_title}: {document.get('document_type')} - {candidate_name}",
+            subject=subject,
             html=html,
             from_name=settings.get("sender_name"),
             from_email=settings.get("sender_email"),
-            metadata={
-                "notification_type": "expiring_credential",
-                "document_id": document.get("id"),
-                "candidate_id": candidate.get("id"),
-                "threshold": threshold
-            }
+            metadata=metadata
         )
         
         return result.success
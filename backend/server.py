@@ -1,23 +1,34 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, Query, UploadFile, File, Form, BackgroundTasks, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, StreamingResponse, JSONResponse, Response
+from fastapi.responses import FileResponse, StreamingResponse, ORJSONResponse, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+import bson
+from bson.raw_bson import RawBSONDocument
 import os
+import asyncio
+import orjson
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, Field, EmailStr, AfterValidator
+from typing import Annotated, List, Optional
 import uuid
-from datetime import datetime, timezone, timedelta
-from jose import JWTError, jwt
+import base64
+from datetime import date, datetime, timezone, timedelta
+import jwt
+from jwt import PyJWTError
 from passlib.context import CryptContext
-import secrets
 import shutil
+import hashlib
+import hmac
+import time
 import aiofiles
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 
 # Import Storage Provider abstraction
 from storage_provider import get_storage_provider, LocalStorageProvider
@@ -25,6 +36,9 @@ from storage_provider import get_storage_provider, LocalStorageProvider
 # Import Notification Service
 from notification_service import NotificationService
 
+from cache import TTLCache
+from batch_writer import BatchWriter
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
@@ -39,32 +53,74 @@ storage_provider = get_storage_provider()
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# The pool is sized for the concurrent queries list and dashboard endpoints fan out
+# to; waiting for a connection fails fast rather than queueing requests indefinitely.
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=int(os.environ.get('MONGO_MAX_POOL_SIZE', 200)),
+    minPoolSize=int(os.environ.get('MONGO_MIN_POOL_SIZE', 20)),
+    waitQueueTimeoutMS=int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', 2000)),
+)
 db = client[os.environ['DB_NAME']]
 
 # Initialize notification service
 notification_service = NotificationService(db)
 
+# Activity entries are written in the background in batches, off the request path
+activity_log = BatchWriter(db.activities)
+
 # JWT Settings
-SECRET_KEY = os.environ.get('JWT_SECRET_KEY', secrets.token_hex(32))
+# Required: a per-process random fallback would give every worker a different key,
+# invalidating tokens whenever a request lands on another worker or after a restart
+SECRET_KEY = os.environ['JWT_SECRET_KEY']
+SECRET_KEY_BYTES = SECRET_KEY.encode()
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Verified tokens -> user, so repeat requests skip JWT decode and the users lookup.
+# Short TTL bounds how long a changed/removed user can still be served per worker.
+AUTH_CACHE_TTL = 60  # seconds
+auth_cache = TTLCache(maxsize=4096, ttl=AUTH_CACHE_TTL)
+
+# Password hashing (10 rounds; existing 12-round hashes still verify)
+pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=10, deprecated="auto")
+# Recent successful verifications, keyed by an HMAC so no plaintext is held
+password_verify_cache = TTLCache(maxsize=1024, ttl=60)
+# bcrypt releases the GIL, so a thread pool runs hashes in parallel off the event
+# loop; the semaphore bounds how many requests can queue for it
+PASSWORD_HASH_WORKERS = os.cpu_count() or 1
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+password_semaphore = asyncio.Semaphore(PASSWORD_HASH_WORKERS * 2)
 security = HTTPBearer()
 
-app = FastAPI(title="McCare Global ATS API")
+app = FastAPI(title="McCare Global ATS API", default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logging.basicConfig(
+    level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
 logger = logging.getLogger(__name__)
 
 # ==================== MODELS ====================
 
+def normalize_date_string(value: Optional[str]) -> Optional[str]:
+    """Cut a full ISO timestamp to its "YYYY-MM-DD" date part; other values are kept as given"""
+    # Dates are stored as strings, so they only compare (and range-scan) correctly
+    # when every value has the same date-only format
+    if value and len(value) > 10:
+        try:
+            date.fromisoformat(value[:10])
+        except ValueError:
+            return value
+        return value[:10]
+    return value
+
+DateString = Annotated[str, AfterValidator(normalize_date_string)]
+
 class UserRole(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: new_id())
     name: str
     permissions: List[str] = []
 
@@ -87,6 +143,8 @@ class UserResponse(BaseModel):
     role: str
     created_at: str
 
+USER_RESPONSE_PROJECTION = {"_id": 0, **{field: 1 for field in UserResponse.model_fields}}
+
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
@@ -227,14 +285,14 @@ class DocumentCreate(BaseModel):
     document_type: str
     file_url: str
     issue_date: Optional[str] = None
-    expiry_date: Optional[str] = None
+    expiry_date: Optional[DateString] = None
     notes: Optional[str] = None
 
 class DocumentUpdate(BaseModel):
     document_type: Optional[str] = None
     file_url: Optional[str] = None
     issue_date: Optional[str] = None
-    expiry_date: Optional[str] = None
+    expiry_date: Optional[DateString] = None
     status: Optional[str] = None
     verified_by: Optional[str] = None
     notes: Optional[str] = None
@@ -297,8 +355,8 @@ class AssignmentCreate(BaseModel):
     candidate_id: str
     job_order_id: str
     facility_id: str
-    start_date: str
-    end_date: str
+    start_date: DateString
+    end_date: DateString
     shift_pattern: Optional[str] = None
     contract_type: str = "Travel"
     pay_rate_regular: Optional[float] = None
@@ -309,8 +367,8 @@ class AssignmentCreate(BaseModel):
     notes: Optional[str] = None
 
 class AssignmentUpdate(BaseModel):
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
+    start_date: Optional[DateString] = None
+    end_date: Optional[DateString] = None
     shift_pattern: Optional[str] = None
     contract_type: Optional[str] = None
     pay_rate_regular: Optional[float] = None
@@ -356,50 +414,258 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+async def hash_password_async(password: str) -> str:
+    async with password_semaphore:
+        return await asyncio.get_running_loop().run_in_executor(password_executor, hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    # The cache is checked and filled here on the event loop; only bcrypt runs in the pool
+    cache_key = hmac.new(
+        SECRET_KEY_BYTES, f"{plain_password}\0{hashed_password}".encode(), hashlib.sha256
+    ).digest()
+    if password_verify_cache.get(cache_key):
+        return True
+    async with password_semaphore:
+        verified = await asyncio.get_running_loop().run_in_executor(
+            password_executor, verify_password, plain_password, hashed_password
+        )
+    if verified:
+        password_verify_cache.set(cache_key, True)
+    return verified
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(to_encode, SECRET_KEY_BYTES, algorithm=ALGORITHM)
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    user = auth_cache.get(cache_key)
+    if user is not None:
+        return user
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY_BYTES, algorithms=[ALGORITHM])
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
         user = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
+        # Never serve a cached user past the token's own expiry
+        ttl = min(AUTH_CACHE_TTL, payload.get("exp", 0) - time.time())
+        if ttl > 0:
+            auth_cache.set(cache_key, user, ttl=ttl)
         return user
-    except JWTError:
+    except PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+# Ids are opaque strings, so records created before new_id() keep their
+# 36-character uuid ids and both formats are looked up the same way
+def new_id() -> str:
+    """Random record id: a uuid4 encoded as 22 url-safe base64 characters"""
+    return base64.urlsafe_b64encode(uuid.uuid4().bytes).rstrip(b"=").decode()
+
+def new_ids(count: int) -> List[str]:
+    """count ids like new_id(), drawing all the random bytes with one os.urandom call"""
+    random_bytes = os.urandom(16 * count)
+    return [
+        base64.urlsafe_b64encode(uuid.UUID(bytes=random_bytes[i:i + 16], version=4).bytes).rstrip(b"=").decode()
+        for i in range(0, 16 * count, 16)
+    ]
+
 def serialize_doc(doc):
     """Remove _id and convert ObjectId to string"""
     if doc and "_id" in doc:
         del doc["_id"]
     return doc
 
+# List endpoints stream up to LIST_LIMIT documents, LIST_BATCH_SIZE per cursor batch
+LIST_LIMIT = 1000
+LIST_BATCH_SIZE = 200
+
+MS_PER_DAY = 24 * 60 * 60 * 1000
+
+def _json_default(value):
+    # orjson handles datetime/date/UUID natively; anything else (e.g. ObjectId) as text
+    return str(value)
+
+# Encoded GET responses (unpaged lists, dashboard stats) keyed by path, query
+# string and the cache generations of the collections the response reads. The
+# generations live in one cache_state document that write routes increment for
+# the collections they change, so a write on any worker retires the affected
+# responses in every worker; stale entries age out by TTL.
+RESPONSE_CACHE_TTL = 10
+DASHBOARD_CACHE_TTL = 30
+RESPONSE_CACHE_STATE_ID = "responses"
+response_cache = TTLCache(maxsize=64, ttl=RESPONSE_CACHE_TTL)
+
+async def get_response_generations(collections: tuple) -> tuple:
+    """Current cache generations of the given collections, shared by every worker"""
+    state = await db.cache_state.find_one(
+        {"_id": RESPONSE_CACHE_STATE_ID}, {name: 1 for name in collections}
+    ) or {}
+    return tuple(state.get(name, 0) for name in collections)
+
+async def bump_response_generations(collections: tuple):
+    """Invalidate cached responses that read any of the given collections, in every worker"""
+    await db.cache_state.update_one(
+        {"_id": RESPONSE_CACHE_STATE_ID}, {"$inc": {name: 1 for name in collections}}, upsert=True
+    )
+
+class ResponseCache:
+    """Request-scoped handle on response_cache (paged requests are not cached)"""
+    def __init__(self, key: Optional[tuple]):
+        self.key = key
+
+    def response(self) -> Optional[Response]:
+        """The cached response for this request, if any"""
+        body = response_cache.get(self.key) if self.key else None
+        return Response(body, media_type="application/json") if body is not None else None
+
+    def store(self, body: bytes, ttl: Optional[float] = None):
+        """Cache the encoded body under the generations read when this request began"""
+        if self.key:
+            response_cache.set(self.key, body, ttl=ttl)
+
+def cached_response(*collections: str):
+    """
+    Dependency giving a ResponseCache keyed by the generations of `collections`.
+    Authentication is resolved first, and the generations are read before the
+    handler queries anything, so a response built while a write was running is
+    stored under a generation that the write's bump has already retired.
+    """
+    async def get_response_cache(
+        request: Request, current_user: dict = Depends(get_current_user)
+    ) -> ResponseCache:
+        if "page" in request.query_params:
+            return ResponseCache(None)
+        generations = await get_response_generations(collections)
+        return ResponseCache((request.url.path, request.url.query, generations))
+    return get_response_cache
+
+def invalidates(*collections: str):
+    """
+    Route dependency that bumps the cache generations of `collections` once the
+    handler has returned, before the response is sent. Requests that raise
+    (HTTPException included) leave the cache untouched.
+    """
+    async def invalidate_response_cache():
+        yield
+        await bump_response_generations(collections)
+    return Depends(invalidate_response_cache)
+
+
+def stream_json_array(cursor, cache: Optional[ResponseCache] = None) -> StreamingResponse:
+    """
+    Stream a Motor cursor as a JSON array, encoding one cursor batch at a time.
+    With a cache handle, the complete body is stored once streaming finishes.
+    """
+    async def body():
+        chunks = [] if cache is not None and cache.key else None
+        batch = []
+        sep = b"["
+        async for doc in cursor:
+            batch.append(orjson.dumps(doc, default=_json_default, option=orjson.OPT_NON_STR_KEYS))
+            if len(batch) >= LIST_BATCH_SIZE:
+                chunk = sep + b",".join(batch)
+                if chunks is not None:
+                    chunks.append(chunk)
+                yield chunk
+                batch, sep = [], b","
+        chunk = (sep + b",".join(batch) if batch or sep == b"[" else b"") + b"]"
+        yield chunk
+        if chunks is not None:
+            chunks.append(chunk)
+            cache.store(b"".join(chunks))
+    return StreamingResponse(body(), media_type="application/json")
+
+def build_query(**fields) -> dict:
+    """Equality filter from the given field values, skipping empty ones"""
+    return {field: value for field, value in fields.items() if value}
+
+def multi_value_filter(values: Optional[str], single: Optional[str] = None):
+    """
+    Filter value for a comma-separated multi-select parameter, falling back to
+    its single-value counterpart. Returns None when neither is set.
+    """
+    if values:
+        items = [v.strip() for v in values.split(",") if v.strip()]
+        return {"$in": items} if items else None
+    return single
+
+class Pagination:
+    """
+    Optional page/page_size query parameters for list endpoints.
+
+    Without `page` the endpoint returns its full (LIST_LIMIT-capped) list as before.
+    With `page`, results are ordered newest first and the response carries the
+    total number of matches in an X-Total-Count header.
+    """
+    def __init__(
+        self,
+        page: Optional[int] = Query(None, ge=1),
+        page_size: int = Query(50, ge=1, le=200)
+    ):
+        self.page = page
+        self.page_size = page_size
+
+    @property
+    def skip(self) -> int:
+        return (self.page - 1) * self.page_size if self.page else 0
+
+    @property
+    def limit(self) -> int:
+        return self.page_size if self.page else LIST_LIMIT
+
+    def apply(self, cursor):
+        """Window a find() cursor to the requested page"""
+        if self.page:
+            cursor = cursor.sort("created_at", -1).skip(self.skip)
+        return cursor.limit(self.limit)
+
+    def stages(self) -> List[dict]:
+        """The same window as apply(), as aggregation pipeline stages"""
+        window = [{"$sort": {"created_at": -1}}, {"$skip": self.skip}] if self.page else []
+        return window + [{"$limit": self.limit}]
+
+    async def add_total(self, response: Response, collection, query: dict) -> Response:
+        """Set X-Total-Count on paged responses"""
+        if self.page:
+            total = await collection.count_documents(query) if query else await collection.estimated_document_count()
+            response.headers["X-Total-Count"] = str(total)
+        return response
+
+def parse_expiry_date(value: str) -> date:
+    """Parse a stored expiry date ("YYYY-MM-DD" or full ISO timestamp) to a date"""
+    # The date part of an ISO string is its first 10 characters, which
+    # date.fromisoformat parses far faster than strptime/datetime.fromisoformat
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        if "T" in value:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+        return datetime.strptime(value, "%Y-%m-%d").date()
+
 # ==================== AUTH ENDPOINTS ====================
 
 @api_router.post("/auth/register", response_model=TokenResponse)
 async def register(user: UserCreate):
-    existing = await db.users.find_one({"email": user.email})
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
     user_dict = {
-        "id": str(uuid.uuid4()),
+        "id": new_id(),
         "email": user.email,
-        "password": hash_password(user.password),
+        "password": await hash_password_async(user.password),
         "first_name": user.first_name,
         "last_name": user.last_name,
         "role": user.role,
         "created_at": datetime.now(timezone.utc).isoformat()
     }
-    await db.users.insert_one(user_dict)
+    # Duplicates are rejected by the unique users.email index (migration 006)
+    try:
+        await db.users.insert_one(user_dict)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     token = create_access_token({"sub": user_dict["id"], "role": user_dict["role"]})
     return TokenResponse(
@@ -417,7 +683,7 @@ async def register(user: UserCreate):
 @api_router.post("/auth/login", response_model=TokenResponse)
 async def login(credentials: UserLogin):
     user = await db.users.find_one({"email": credentials.email})
-    if not user or not verify_password(credentials.password, user["password"]):
+    if not user or not await verify_password_async(credentials.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     token = create_access_token({"sub": user["id"], "role": user["role"]})
@@ -441,8 +707,9 @@ async def get_me(current_user: dict = Depends(get_current_user)):
 async def get_users(current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "Admin":
         raise HTTPException(status_code=403, detail="Admin access required")
-    users = await db.users.find({}, {"_id": 0, "password": 0}).to_list(1000)
-    return [UserResponse(**u) for u in users]
+    users = await db.users.find({}, USER_RESPONSE_PROJECTION).to_list(1000)
+    # Projection already matches UserResponse; return directly to skip per-row validation
+    return ORJSONResponse(users)
 
 # ==================== LEADS ENDPOINTS ====================
 
@@ -461,49 +728,22 @@ async def get_leads(
     date_from: Optional[str] = None,  # ISO date string
     date_to: Optional[str] = None,  # ISO date string
     search: Optional[str] = None,  # Text search for name/email
+    pagination: Pagination = Depends(),
+    cache: ResponseCache = Depends(cached_response("leads")),
     current_user: dict = Depends(get_current_user)
 ):
-    query = {}
-    
-    # Stage filter (single or multi)
-    if stages:
-        stage_list = [s.strip() for s in stages.split(",") if s.strip()]
-        if stage_list:
-            query["stage"] = {"$in": stage_list}
-    elif stage:
-        query["stage"] = stage
-    
-    # Specialty filter (single or multi)
-    if specialties:
-        specialty_list = [s.strip() for s in specialties.split(",") if s.strip()]
-        if specialty_list:
-            query["specialty"] = {"$in": specialty_list}
-    elif specialty:
-        query["specialty"] = specialty
-    
-    # Province filter (single or multi)
-    if provinces:
-        province_list = [p.strip() for p in provinces.split(",") if p.strip()]
-        if province_list:
-            query["province_preference"] = {"$in": province_list}
-    elif province:
-        query["province_preference"] = province
-    
-    # Recruiter filter (single or multi)
-    if recruiters:
-        recruiter_list = [r.strip() for r in recruiters.split(",") if r.strip()]
-        if recruiter_list:
-            query["recruiter_id"] = {"$in": recruiter_list}
-    elif recruiter_id:
-        query["recruiter_id"] = recruiter_id
-    
-    # Source filter (single or multi)
-    if sources:
-        source_list = [s.strip() for s in sources.split(",") if s.strip()]
-        if source_list:
-            query["source"] = {"$in": source_list}
-    elif source:
-        query["source"] = source
+    cached = cache.response()
+    if cached is not None:
+        return cached
+    
+    # Single or multi-select filters
+    query = build_query(
+        stage=multi_value_filter(stages, stage),
+        specialty=multi_value_filter(specialties, specialty),
+        province_preference=multi_value_filter(provinces, province),
+        recruiter_id=multi_value_filter(recruiters, recruiter_id),
+        source=multi_value_filter(sources, source)
+    )
     
     # Date range filter
     if date_from or date_to:
@@ -525,29 +765,30 @@ async def get_leads(
             {"email": search_regex}
         ]
     
-    leads = await db.leads.find(query, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    return leads
+    cursor = pagination.apply(db.leads.find(query, {"_id": 0}).sort("created_at", -1).batch_size(LIST_BATCH_SIZE))
+    return await pagination.add_total(stream_json_array(cursor, cache), db.leads, query)
 
-@api_router.post("/leads")
+@api_router.post("/leads", dependencies=[invalidates("leads")])
 async def create_lead(lead: LeadCreate, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user)):
     lead_dict = lead.model_dump()
-    lead_dict["id"] = str(uuid.uuid4())
+    lead_dict["id"] = new_id()
     lead_dict["stage"] = "New Lead"
     lead_dict["recruiter_id"] = current_user["id"]
-    lead_dict["created_at"] = datetime.now(timezone.utc).isoformat()
-    lead_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+    now = datetime.now(timezone.utc).isoformat()
+    lead_dict["created_at"] = now
+    lead_dict["updated_at"] = now
     
     await db.leads.insert_one(lead_dict)
     
     # Log activity
-    await db.activities.insert_one({
-        "id": str(uuid.uuid4()),
+    activity_log.add({
+        "id": new_id(),
         "entity_type": "lead",
         "entity_id": lead_dict["id"],
         "activity_type": "created",
         "description": f"Lead created: {lead.first_name} {lead.last_name}",
         "user_id": current_user["id"],
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": now
     })
     
     # Send new lead notification (background task)
@@ -575,10 +816,11 @@ VALID_LEAD_STAGES = [
     "Rejected"
 ]
 
-@api_router.put("/leads/{lead_id}")
+@api_router.put("/leads/{lead_id}", dependencies=[invalidates("leads")])
 async def update_lead(lead_id: str, lead_update: LeadUpdate, current_user: dict = Depends(get_current_user)):
-    update_data = {k: v for k, v in lead_update.model_dump().items() if v is not None}
-    update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+    update_data = lead_update.model_dump(exclude_none=True)
+    now = datetime.now(timezone.utc).isoformat()
+    update_data["updated_at"] = now
     
     # Validate stage if being updated
     if "stage" in update_data:
@@ -586,45 +828,47 @@ async def update_lead(lead_id: str, lead_update: LeadUpdate, current_user: dict
         if new_stage not in VALID_LEAD_STAGES:
             raise HTTPException(status_code=400, detail=f"Invalid stage. Must be one of: {', '.join(VALID_LEAD_STAGES)}")
     
-    # Get current lead to track stage change
-    current_lead = await db.leads.find_one({"id": lead_id}, {"_id": 0, "stage": 1})
-    if not current_lead:
+    # Update and read back in one round-trip; the pre-update document gives the
+    # old stage for history tracking, and the update is applied to it locally
+    lead = await db.leads.find_one_and_update(
+        {"id": lead_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE
+    )
+    if lead is None:
         raise HTTPException(status_code=404, detail="Lead not found")
     
-    old_stage = current_lead.get("stage")
-    
-    result = await db.leads.update_one({"id": lead_id}, {"$set": update_data})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Lead not found")
+    old_stage = lead.get("stage")
+    lead.update(update_data)
     
     # Log stage change if applicable
     if "stage" in update_data and update_data["stage"] != old_stage:
         # Log to activities
-        await db.activities.insert_one({
-            "id": str(uuid.uuid4()),
+        activity_log.add({
+            "id": new_id(),
             "entity_type": "lead",
             "entity_id": lead_id,
             "activity_type": "stage_change",
             "description": f"Stage changed from '{old_stage}' to '{update_data['stage']}'",
             "user_id": current_user["id"],
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now
         })
         
         # Log to lead_stage_history for detailed tracking
         await db.lead_stage_history.insert_one({
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "lead_id": lead_id,
             "from_stage": old_stage,
             "to_stage": update_data["stage"],
             "changed_by": current_user["id"],
             "changed_by_name": f"{current_user.get('first_name', '')} {current_user.get('last_name', '')}",
-            "changed_at": datetime.now(timezone.utc).isoformat()
+            "changed_at": now
         })
     
-    lead = await db.leads.find_one({"id": lead_id}, {"_id": 0})
     return lead
 
-@api_router.delete("/leads/{lead_id}")
+@api_router.delete("/leads/{lead_id}", dependencies=[invalidates("leads")])
 async def delete_lead(lead_id: str, current_user: dict = Depends(get_current_user)):
     result = await db.leads.delete_one({"id": lead_id})
     if result.deleted_count == 0:
@@ -699,7 +943,7 @@ async def check_duplicate_candidate(lead_id: str, current_user: dict = Depends(g
     
     return {"duplicate_found": False}
 
-@api_router.post("/leads/{lead_id}/convert")
+@api_router.post("/leads/{lead_id}/convert", dependencies=[invalidates("leads", "candidates")])
 async def convert_lead_to_candidate(
     lead_id: str, 
     request: ConvertLeadRequest = ConvertLeadRequest(),
@@ -760,8 +1004,8 @@ async def convert_lead_to_candidate(
             )
         
         # Log activity
-        await db.activities.insert_one({
-            "id": str(uuid.uuid4()),
+        activity_log.add({
+            "id": new_id(),
             "entity_type": "lead",
             "entity_id": lead_id,
             "activity_type": "linked_to_candidate",
@@ -799,7 +1043,7 @@ async def convert_lead_to_candidate(
         }
     
     # Create new candidate from lead
-    candidate_id = str(uuid.uuid4())
+    candidate_id = new_id()
     candidate_dict = {
         "id": candidate_id,
         "first_name": lead["first_name"],
@@ -834,8 +1078,8 @@ async def convert_lead_to_candidate(
     )
     
     # Log conversion activity
-    await db.activities.insert_one({
-        "id": str(uuid.uuid4()),
+    activity_log.add({
+        "id": new_id(),
         "entity_type": "lead",
         "entity_id": lead_id,
         "activity_type": "converted_to_candidate",
@@ -849,8 +1093,8 @@ async def convert_lead_to_candidate(
     })
     
     # Also log on candidate side
-    await db.activities.insert_one({
-        "id": str(uuid.uuid4()),
+    activity_log.add({
+        "id": new_id(),
         "entity_type": "candidate",
         "entity_id": candidate_id,
         "activity_type": "created_from_lead",
@@ -870,19 +1114,14 @@ async def convert_lead_to_candidate(
         "candidate": serialize_doc(candidate_dict)
     }
 
-@api_router.put("/leads/{lead_id}/reject")
+@api_router.put("/leads/{lead_id}/reject", dependencies=[invalidates("leads")])
 async def reject_lead(lead_id: str, reason: Optional[str] = None, current_user: dict = Depends(get_current_user)):
     """
     Reject a lead and move it to Rejected stage.
     Logs rejection reason if provided.
     """
-    lead = await db.leads.find_one({"id": lead_id}, {"_id": 0})
-    if not lead:
-        raise HTTPException(status_code=404, detail="Lead not found")
-    
     now = datetime.now(timezone.utc).isoformat()
     user_name = f"{current_user.get('first_name', '')} {current_user.get('last_name', '')}".strip()
-    old_stage = lead.get("stage")
     
     # Update lead stage to Rejected
     update_data = {
@@ -893,15 +1132,24 @@ async def reject_lead(lead_id: str, reason: Optional[str] = None, current_user:
         "updated_at": now
     }
     
-    await db.leads.update_one({"id": lead_id}, {"$set": update_data})
+    # Returns the lead as it was before the update, for the stage history
+    lead = await db.leads.find_one_and_update(
+        {"id": lead_id},
+        {"$set": update_data},
+        projection={"_id": 0, "stage": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if lead is None:
+        raise HTTPException(status_code=404, detail="Lead not found")
+    old_stage = lead.get("stage")
     
     # Log activity
     description = f"Lead rejected by {user_name}"
     if reason:
         description += f". Reason: {reason}"
     
-    await db.activities.insert_one({
-        "id": str(uuid.uuid4()),
+    activity_log.add({
+        "id": new_id(),
         "entity_type": "lead",
         "entity_id": lead_id,
         "activity_type": "rejected",
@@ -912,7 +1160,7 @@ async def reject_lead(lead_id: str, reason: Optional[str] = None, current_user:
     
     # Log stage history
     await db.lead_stage_history.insert_one({
-        "id": str(uuid.uuid4()),
+        "id": new_id(),
         "lead_id": lead_id,
         "from_stage": old_stage,
         "to_stage": "Rejected",
@@ -924,7 +1172,7 @@ async def reject_lead(lead_id: str, reason: Optional[str] = None, current_user:
     
     return {"message": "Lead rejected successfully", "stage": "Rejected"}
 
-@api_router.put("/leads/{lead_id}/assign")
+@api_router.put("/leads/{lead_id}/assign", dependencies=[invalidates("leads")])
 async def assign_recruiter_to_lead(lead_id: str, recruiter_id: str, current_user: dict = Depends(get_current_user)):
     """
     Assign a recruiter to a lead.
@@ -934,24 +1182,24 @@ async def assign_recruiter_to_lead(lead_id: str, recruiter_id: str, current_user
     if not recruiter:
         raise HTTPException(status_code=404, detail="Recruiter not found")
     
-    lead = await db.leads.find_one({"id": lead_id}, {"_id": 0})
-    if not lead:
-        raise HTTPException(status_code=404, detail="Lead not found")
-    
     now = datetime.now(timezone.utc).isoformat()
     user_name = f"{current_user.get('first_name', '')} {current_user.get('last_name', '')}".strip()
     recruiter_name = f"{recruiter.get('first_name', '')} {recruiter.get('last_name', '')}".strip()
     
-    old_recruiter_id = lead.get("recruiter_id")
-    
-    await db.leads.update_one(
+    lead = await db.leads.find_one_and_update(
         {"id": lead_id},
-        {"$set": {"recruiter_id": recruiter_id, "updated_at": now}}
+        {"$set": {"recruiter_id": recruiter_id, "updated_at": now}},
+        projection={"_id": 0, "recruiter_id": 1},
+        return_document=ReturnDocument.BEFORE
     )
+    if lead is None:
+        raise HTTPException(status_code=404, detail="Lead not found")
+    
+    old_recruiter_id = lead.get("recruiter_id")
     
     # Log activity
-    await db.activities.insert_one({
-        "id": str(uuid.uuid4()),
+    activity_log.add({
+        "id": new_id(),
         "entity_type": "lead",
         "entity_id": lead_id,
         "activity_type": "recruiter_assigned",
@@ -992,8 +1240,9 @@ async def get_lead_capture_settings():
     settings = await db.lead_capture_settings.find_one({}, {"_id": 0})
     if not settings:
         # Create default settings
+        now = datetime.now(timezone.utc).isoformat()
         settings = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "required_fields": ["first_name", "last_name", "email"],
             "optional_fields": ["phone", "specialty", "province_preference", "notes"],
             "default_pipeline_stage": "New Lead",
@@ -1006,8 +1255,8 @@ async def get_lead_capture_settings():
             "auto_convert_to_candidate": False,
             "notify_on_new_lead": True,
             "allowed_sources": ["ATS Form", "API", "HubSpot", "Website", "Landing Page"],
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now,
+            "updated_at": now
         }
         await db.lead_capture_settings.insert_one(settings)
     return settings
@@ -1024,7 +1273,7 @@ async def apply_auto_tags(lead_data: dict, rules: list) -> List[str]:
 async def create_lead_audit_log(lead_id: str, source: str, payload: dict, auto_fields: list, auto_tags: list, recruiter_id: str = None, auto_converted: bool = False):
     """Create audit log entry for lead intake"""
     audit_entry = {
-        "id": str(uuid.uuid4()),
+        "id": new_id(),
         "lead_id": lead_id,
         "source": source,
         "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -1073,7 +1322,7 @@ async def log_lead_intake(request: Request, form_id: str, payload: dict, source:
     }
     
     log_entry = {
-        "id": str(uuid.uuid4()),
+        "id": new_id(),
         "created_at": datetime.now(timezone.utc).isoformat(),
         "origin": origin,
         "ip": client_ip,
@@ -1122,7 +1371,7 @@ async def process_lead_intake(lead_data: dict, source: str) -> dict:
     settings = await get_lead_capture_settings()
     
     # Generate lead ID
-    lead_id = str(uuid.uuid4())
+    lead_id = new_id()
     now = datetime.now(timezone.utc).isoformat()
     
     # Build tags list
@@ -1167,12 +1416,14 @@ async def process_lead_intake(lead_data: dict, source: str) -> dict:
         "updated_at": now
     }
     
-    # Insert lead
+    # Insert lead (public intake routes report errors in the body, so they
+    # invalidate cached lead lists here rather than through invalidates())
     await db.leads.insert_one(lead_dict)
+    await bump_response_generations(("leads",))
     
     # Log activity
-    await db.activities.insert_one({
-        "id": str(uuid.uuid4()),
+    activity_log.add({
+        "id": new_id(),
         "entity_type": "lead",
         "entity_id": lead_id,
         "activity_type": "created",
@@ -1196,7 +1447,7 @@ async def process_lead_intake(lead_data: dict, source: str) -> dict:
         has_all_required = all(lead_dict.get(f) for f in required)
         if has_all_required:
             candidate_dict = {
-                "id": str(uuid.uuid4()),
+                "id": new_id(),
                 "first_name": lead_dict["first_name"],
                 "last_name": lead_dict["last_name"],
                 "email": lead_dict["email"],
@@ -1268,6 +1519,7 @@ async def submit_public_lead(lead: PublicLeadSubmission, request: Request):
             update_data = {k: v for k, v in lead_data.items() if v is not None}
             update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
             await db.leads.update_one({"email": lead.email}, {"$set": update_data})
+            await bump_response_generations(("leads",))
             
             # Create audit log for update
             await create_lead_audit_log(
@@ -1346,7 +1598,7 @@ async def get_public_lead_capture_settings(request: Request):
     
     # Log the settings fetch
     log_entry = {
-        "id": str(uuid.uuid4()),
+        "id": new_id(),
         "created_at": now,
         "origin": request.headers.get("origin", "unknown"),
         "referer": request.headers.get("referer", "unknown"),
@@ -1380,7 +1632,7 @@ async def get_public_lead_capture_settings(request: Request):
         
         await db.lead_intake_logs.insert_one(log_entry)
         
-        return JSONResponse(
+        return ORJSONResponse(
             content=public_settings,
             headers={
                 "Access-Control-Allow-Origin": "*",
@@ -1411,7 +1663,7 @@ async def get_public_lead_capture_settings(request: Request):
             }
         }
         
-        return JSONResponse(
+        return ORJSONResponse(
             content=default_settings,
             headers={
                 "Access-Control-Allow-Origin": "*",
@@ -1453,7 +1705,7 @@ async def submit_form_lead(request: Request, payload: dict):
         if not email:
             error_msg = "Email is required"
             await update_lead_intake_log(log_entry["id"], "validation_error", error=error_msg)
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=400,
                 content={"status": "error", "detail": error_msg}
             )
@@ -1464,7 +1716,7 @@ async def submit_form_lead(request: Request, payload: dict):
         if not first_name or not last_name:
             error_msg = "First name and last name are required"
             await update_lead_intake_log(log_entry["id"], "validation_error", error=error_msg)
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=400,
                 content={"status": "error", "detail": error_msg}
             )
@@ -1494,7 +1746,7 @@ async def submit_form_lead(request: Request, payload: dict):
         
         logger.info(f"Form submission successful: lead_id={result['id']}")
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "status": "success", 
@@ -1505,14 +1757,14 @@ async def submit_form_lead(request: Request, payload: dict):
         )
     except HTTPException as he:
         await update_lead_intake_log(log_entry["id"], "error", error=str(he.detail))
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=he.status_code,
             content={"status": "error", "detail": str(he.detail)}
         )
     except Exception as e:
         logger.error(f"Form submission error: {e}", exc_info=True)
         await update_lead_intake_log(log_entry["id"], "error", error=str(e))
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"status": "error", "detail": "An error occurred processing your submission. Please try again."}
         )
@@ -1570,6 +1822,7 @@ async def hubspot_webhook(payload: dict):
                 update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
                 update_data["source"] = "HubSpot"  # Update source
                 await db.leads.update_one({"email": lead_data["email"]}, {"$set": update_data})
+                await bump_response_generations(("leads",))
                 
                 await create_lead_audit_log(
                     lead_id=existing["id"],
@@ -1650,17 +1903,21 @@ async def update_lead_settings(settings_update: dict, current_user: dict = Depen
     if current_user["role"] != "Admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    settings_update["updated_at"] = datetime.now(timezone.utc).isoformat()
-    
-    existing = await db.lead_capture_settings.find_one({})
-    if existing:
-        await db.lead_capture_settings.update_one({}, {"$set": settings_update})
-    else:
-        settings_update["id"] = str(uuid.uuid4())
-        settings_update["created_at"] = datetime.now(timezone.utc).isoformat()
-        await db.lead_capture_settings.insert_one(settings_update)
-    
-    return await get_lead_capture_settings()
+    now = datetime.now(timezone.utc).isoformat()
+    settings_update["updated_at"] = now
+    
+    # Upsert the singleton settings document and read it back in one round-trip
+    on_insert = {k: v for k, v in (("id", new_id()), ("created_at", now)) if k not in settings_update}
+    update = {"$set": settings_update}
+    if on_insert:
+        update["$setOnInsert"] = on_insert
+    return await db.lead_capture_settings.find_one_and_update(
+        {},
+        update,
+        projection={"_id": 0},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
 
 @api_router.get("/lead-capture/embed-code")
 async def get_embed_code(current_user: dict = Depends(get_current_user)):
@@ -1914,9 +2171,7 @@ async def get_lead_audit_logs(
     if current_user["role"] not in ["Admin", "Recruiter"]:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    query = {}
-    if lead_id:
-        query["lead_id"] = lead_id
+    query = build_query(lead_id=lead_id)
     if source:
         query["source"] = {"$regex": source, "$options": "i"}
     
@@ -1976,11 +2231,7 @@ async def get_lead_intake_logs(
     if current_user["role"] not in ["Admin", "Recruiter"]:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    query = {}
-    if status:
-        query["status"] = status
-    if form_id:
-        query["form_id"] = form_id
+    query = build_query(status=status, form_id=form_id)
     
     logs = await db.lead_intake_logs.find(
         query, {"_id": 0}
@@ -2031,27 +2282,26 @@ async def get_candidates(
     specialty: Optional[str] = None,
     province: Optional[str] = None,
     nurse_type: Optional[str] = None,
+    pagination: Pagination = Depends(),
+    cache: ResponseCache = Depends(cached_response("candidates")),
     current_user: dict = Depends(get_current_user)
 ):
-    query = {}
-    if status:
-        query["status"] = status
-    if specialty:
-        query["primary_specialty"] = specialty
-    if province:
-        query["province"] = province
-    if nurse_type:
-        query["nurse_type"] = nurse_type
+    cached = cache.response()
+    if cached is not None:
+        return cached
     
-    candidates = await db.candidates.find(query, {"_id": 0}).to_list(1000)
-    return candidates
+    query = build_query(status=status, primary_specialty=specialty, province=province, nurse_type=nurse_type)
+    
+    cursor = pagination.apply(db.candidates.find(query, {"_id": 0}).batch_size(LIST_BATCH_SIZE))
+    return await pagination.add_total(stream_json_array(cursor, cache), db.candidates, query)
 
-@api_router.post("/candidates")
+@api_router.post("/candidates", dependencies=[invalidates("candidates")])
 async def create_candidate(candidate: CandidateCreate, current_user: dict = Depends(get_current_user)):
     candidate_dict = candidate.model_dump()
-    candidate_dict["id"] = str(uuid.uuid4())
-    candidate_dict["created_at"] = datetime.now(timezone.utc).isoformat()
-    candidate_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+    candidate_dict["id"] = new_id()
+    now = datetime.now(timezone.utc).isoformat()
+    candidate_dict["created_at"] = now
+    candidate_dict["updated_at"] = now
     
     await db.candidates.insert_one(candidate_dict)
     return serialize_doc(candidate_dict)
@@ -2063,19 +2313,22 @@ async def get_candidate(candidate_id: str, current_user: dict = Depends(get_curr
         raise HTTPException(status_code=404, detail="Candidate not found")
     return candidate
 
-@api_router.put("/candidates/{candidate_id}")
+@api_router.put("/candidates/{candidate_id}", dependencies=[invalidates("candidates")])
 async def update_candidate(candidate_id: str, candidate_update: CandidateUpdate, current_user: dict = Depends(get_current_user)):
-    update_data = {k: v for k, v in candidate_update.model_dump().items() if v is not None}
+    update_data = candidate_update.model_dump(exclude_none=True)
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     
-    result = await db.candidates.update_one({"id": candidate_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    candidate = await db.candidates.find_one_and_update(
+        {"id": candidate_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if candidate is None:
         raise HTTPException(status_code=404, detail="Candidate not found")
-    
-    candidate = await db.candidates.find_one({"id": candidate_id}, {"_id": 0})
     return candidate
 
-@api_router.delete("/candidates/{candidate_id}")
+@api_router.delete("/candidates/{candidate_id}", dependencies=[invalidates("candidates")])
 async def delete_candidate(candidate_id: str, current_user: dict = Depends(get_current_user)):
     result = await db.candidates.delete_one({"id": candidate_id})
     if result.deleted_count == 0:
@@ -2089,47 +2342,51 @@ async def get_documents(
     candidate_id: Optional[str] = None,
     document_type: Optional[str] = None,
     status: Optional[str] = None,
+    pagination: Pagination = Depends(),
+    cache: ResponseCache = Depends(cached_response("documents")),
     current_user: dict = Depends(get_current_user)
 ):
-    query = {}
-    if candidate_id:
-        query["candidate_id"] = candidate_id
-    if document_type:
-        query["document_type"] = document_type
-    if status:
-        query["status"] = status
+    cached = cache.response()
+    if cached is not None:
+        return cached
+    
+    query = build_query(candidate_id=candidate_id, document_type=document_type, status=status)
     
-    documents = await db.documents.find(query, {"_id": 0}).to_list(1000)
-    return documents
+    cursor = pagination.apply(db.documents.find(query, {"_id": 0}).batch_size(LIST_BATCH_SIZE))
+    return await pagination.add_total(stream_json_array(cursor, cache), db.documents, query)
 
-@api_router.post("/documents")
+@api_router.post("/documents", dependencies=[invalidates("documents")])
 async def create_document(document: DocumentCreate, current_user: dict = Depends(get_current_user)):
     document_dict = document.model_dump()
-    document_dict["id"] = str(uuid.uuid4())
+    document_dict["id"] = new_id()
     document_dict["status"] = "Pending"
-    document_dict["created_at"] = datetime.now(timezone.utc).isoformat()
-    document_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+    now = datetime.now(timezone.utc).isoformat()
+    document_dict["created_at"] = now
+    document_dict["updated_at"] = now
     
     await db.documents.insert_one(document_dict)
     return serialize_doc(document_dict)
 
-@api_router.put("/documents/{document_id}")
+@api_router.put("/documents/{document_id}", dependencies=[invalidates("documents")])
 async def update_document(document_id: str, document_update: DocumentUpdate, current_user: dict = Depends(get_current_user)):
-    update_data = {k: v for k, v in document_update.model_dump().items() if v is not None}
+    update_data = document_update.model_dump(exclude_none=True)
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     
     if "verified_by" in update_data:
         update_data["verified_by"] = current_user["id"]
         update_data["status"] = "Verified"
     
-    result = await db.documents.update_one({"id": document_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    document = await db.documents.find_one_and_update(
+        {"id": document_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if document is None:
         raise HTTPException(status_code=404, detail="Document not found")
-    
-    document = await db.documents.find_one({"id": document_id}, {"_id": 0})
     return document
 
-@api_router.delete("/documents/{document_id}")
+@api_router.delete("/documents/{document_id}", dependencies=[invalidates("documents")])
 async def delete_document(document_id: str, current_user: dict = Depends(get_current_user)):
     """
     Delete a document and its associated file.
@@ -2166,7 +2423,7 @@ def validate_file(file: UploadFile) -> tuple:
     
     return ext
 
-@api_router.post("/upload/document")
+@api_router.post("/upload/document", dependencies=[invalidates("documents")])
 async def upload_document(
     file: UploadFile = File(...),
     candidate_id: str = Form(...),
@@ -2226,7 +2483,7 @@ async def upload_document(
         raise HTTPException(status_code=500, detail="Failed to save file")
     
     # Create document record
-    doc_id = storage_result.get("file_id", str(uuid.uuid4()))
+    doc_id = storage_result.get("file_id", new_id())
     now = datetime.now(timezone.utc).isoformat()
     document_dict = {
         "id": doc_id,
@@ -2239,7 +2496,7 @@ async def upload_document(
         "file_size": file_size,
         "file_type": ext,
         "issue_date": issue_date,
-        "expiry_date": expiry_date,
+        "expiry_date": normalize_date_string(expiry_date),
         "notes": notes,
         "status": "Pending",
         "uploaded_by": current_user["id"],
@@ -2250,8 +2507,8 @@ async def upload_document(
     await db.documents.insert_one(document_dict)
     
     # Log activity
-    await db.activities.insert_one({
-        "id": str(uuid.uuid4()),
+    activity_log.add({
+        "id": new_id(),
         "entity_type": "document",
         "entity_id": doc_id,
         "activity_type": "uploaded",
@@ -2262,7 +2519,7 @@ async def upload_document(
     
     return serialize_doc(document_dict)
 
-@api_router.post("/upload/document/{document_id}/replace")
+@api_router.post("/upload/document/{document_id}/replace", dependencies=[invalidates("documents")])
 async def replace_document_file(
     document_id: str,
     file: UploadFile = File(...),
@@ -2336,10 +2593,12 @@ async def replace_document_file(
         "updated_at": now
     }
     
-    await db.documents.update_one({"id": document_id}, {"$set": update_data})
-    
-    updated_doc = await db.documents.find_one({"id": document_id}, {"_id": 0})
-    return updated_doc
+    return await db.documents.find_one_and_update(
+        {"id": document_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
 
 @api_router.get("/files/{candidate_id}/{filename}")
 async def get_file(candidate_id: str, filename: str, current_user: dict = Depends(get_current_user)):
@@ -2471,6 +2730,17 @@ REQUIRED_DOCUMENT_TYPES = [
     "BLS/ACLS"
 ]
 
+# Fields of each document and candidate used by the compliance dashboard rows
+COMPLIANCE_DOCUMENT_PROJECTION = {
+    "_id": 0, "id": 1, "candidate_id": 1, "document_type": 1, "status": 1,
+    "expiry_date": 1, "issue_date": 1, "verified_by": 1, "uploaded_by": 1,
+    "file_url": 1, "file_name": 1, "created_at": 1, "updated_at": 1, "notes": 1,
+}
+COMPLIANCE_CANDIDATE_PROJECTION = {
+    "_id": 0, "id": 1, "first_name": 1, "last_name": 1, "email": 1,
+    "phone": 1, "province": 1, "status": 1,
+}
+
 @api_router.get("/compliance/dashboard")
 async def get_compliance_dashboard(
     status: Optional[str] = Query(None, description="Filter by status: Verified, Pending, Expiring Soon, Expired"),
@@ -2507,9 +2777,6 @@ async def get_compliance_dashboard(
     if expiry_to:
         doc_query.setdefault("expiry_date", {})["$lte"] = expiry_to
     
-    # Get all documents
-    documents = await db.documents.find(doc_query, {"_id": 0}).to_list(10000)
-    
     # Get all candidates for joining
     candidate_query = {}
     if province:
@@ -2517,7 +2784,11 @@ async def get_compliance_dashboard(
     if recruiter_id:
         candidate_query["recruiter_id"] = recruiter_id
     
-    candidates_list = await db.candidates.find(candidate_query, {"_id": 0}).to_list(10000)
+    # Fetch only the fields the response is built from
+    documents, candidates_list = await asyncio.gather(
+        db.documents.find(doc_query, COMPLIANCE_DOCUMENT_PROJECTION).to_list(10000),
+        db.candidates.find(candidate_query, COMPLIANCE_CANDIDATE_PROJECTION).to_list(10000)
+    )
     candidates_map = {c["id"]: c for c in candidates_list}
     
     # Filter by candidate name if provided
@@ -2549,10 +2820,7 @@ async def get_compliance_dashboard(
         
         if doc.get("expiry_date"):
             try:
-                if "T" in doc["expiry_date"]:
-                    expiry = datetime.fromisoformat(doc["expiry_date"].replace("Z", "+00:00")).date()
-                else:
-                    expiry = datetime.strptime(doc["expiry_date"], "%Y-%m-%d").date()
+                expiry = parse_expiry_date(doc["expiry_date"])
                 
                 days_remaining = (expiry - today).days
                 is_expired = days_remaining < 0
@@ -2611,9 +2879,13 @@ async def get_compliance_summary(current_user: dict = Depends(get_current_user))
     threshold_30 = (today + timedelta(days=30)).isoformat()
     threshold_7 = (today + timedelta(days=7)).isoformat()
     
-    # Get all documents and candidates
-    documents = await db.documents.find({}, {"_id": 0}).to_list(10000)
-    candidates = await db.candidates.find({"status": "Active"}, {"_id": 0}).to_list(10000)
+    # Get all documents and candidates, with just the fields the counts need
+    documents, candidates = await asyncio.gather(
+        db.documents.find(
+            {}, {"_id": 0, "candidate_id": 1, "document_type": 1, "status": 1, "expiry_date": 1}
+        ).to_list(10000),
+        db.candidates.find({"status": "Active"}, {"_id": 0, "id": 1}).to_list(10000)
+    )
     
     # Document counts
     total_documents = len(documents)
@@ -2700,7 +2972,7 @@ def calculate_candidate_compliance_status(documents: list, today) -> dict:
     Returns status and breakdown.
     """
     if isinstance(today, str):
-        today = datetime.strptime(today, "%Y-%m-%d").date()
+        today = date.fromisoformat(today)
     
     threshold_30 = today + timedelta(days=30)
     
@@ -2726,10 +2998,7 @@ def calculate_candidate_compliance_status(documents: list, today) -> dict:
         
         if expiry_date:
             try:
-                if "T" in expiry_date:
-                    expiry = datetime.fromisoformat(expiry_date.replace("Z", "+00:00")).date()
-                else:
-                    expiry = datetime.strptime(expiry_date, "%Y-%m-%d").date()
+                expiry = parse_expiry_date(expiry_date)
                 
                 if expiry < today:
                     is_expired = True
@@ -2796,10 +3065,7 @@ async def get_candidate_compliance(candidate_id: str, current_user: dict = Depen
         
         if doc.get("expiry_date"):
             try:
-                if "T" in doc["expiry_date"]:
-                    expiry = datetime.fromisoformat(doc["expiry_date"].replace("Z", "+00:00")).date()
-                else:
-                    expiry = datetime.strptime(doc["expiry_date"], "%Y-%m-%d").date()
+                expiry = parse_expiry_date(doc["expiry_date"])
                 
                 days_remaining = (expiry - today).days
                 is_expired = days_remaining < 0
@@ -2836,43 +3102,58 @@ async def get_candidate_compliance(candidate_id: str, current_user: dict = Depen
 @api_router.get("/compliance/expiring")
 async def get_expiring_documents(
     days: int = Query(default=30, ge=1, le=90),
+    cache: ResponseCache = Depends(cached_response("documents", "candidates")),
     current_user: dict = Depends(get_current_user)
 ):
     """Get documents expiring within specified days"""
-    future_date = (datetime.now(timezone.utc) + timedelta(days=days)).isoformat()
-    today = datetime.now(timezone.utc).isoformat()
-    
-    # Get all documents with expiry dates
-    documents = await db.documents.find(
-        {"expiry_date": {"$ne": None}},
-        {"_id": 0}
-    ).to_list(1000)
+    cached = cache.response()
+    if cached is not None:
+        return cached
     
-    expiring = []
-    for doc in documents:
-        if doc.get("expiry_date"):
-            expiry = doc["expiry_date"]
-            if expiry <= future_date:
-                # Get candidate info
-                candidate = await db.candidates.find_one({"id": doc.get("candidate_id")}, {"_id": 0, "first_name": 1, "last_name": 1, "email": 1, "province": 1})
-                doc["candidate_name"] = f"{candidate['first_name']} {candidate['last_name']}" if candidate else "Unknown"
-                doc["candidate_email"] = candidate.get("email") if candidate else None
-                doc["candidate_province"] = candidate.get("province") if candidate else None
-                doc["is_expired"] = expiry < today
-                
-                # Calculate days remaining
-                try:
-                    if "T" in expiry:
-                        expiry_date = datetime.fromisoformat(expiry.replace("Z", "+00:00")).date()
-                    else:
-                        expiry_date = datetime.strptime(expiry, "%Y-%m-%d").date()
-                    doc["days_remaining"] = (expiry_date - datetime.now(timezone.utc).date()).days
-                except:
-                    doc["days_remaining"] = None
-                
-                expiring.append(doc)
+    now = datetime.now(timezone.utc)
+    future_date = (now + timedelta(days=days)).isoformat()
+    today = now.isoformat()
     
-    return sorted(expiring, key=lambda x: x.get("expiry_date", ""))
+    # Filter, sort, join and derive every output field in Mongo (expiry_date index),
+    # so the documents are streamed straight through without a Python pass
+    today_date = now.date()
+    today_start = datetime(today_date.year, today_date.month, today_date.day, tzinfo=timezone.utc)
+    pipeline = [
+        {"$match": {"expiry_date": {"$gt": "", "$lte": future_date}}},
+        {"$sort": {"expiry_date": 1}},
+        {"$limit": LIST_LIMIT},
+        {"$lookup": {
+            "from": "candidates",
+            "localField": "candidate_id",
+            "foreignField": "id",
+            "as": "candidate"
+        }},
+        {"$addFields": {"candidate": {"$arrayElemAt": ["$candidate", 0]}}},
+        {"$addFields": {
+            "candidate_name": {"$cond": [
+                {"$ifNull": ["$candidate", False]},
+                {"$concat": ["$candidate.first_name", " ", "$candidate.last_name"]},
+                "Unknown"
+            ]},
+            "candidate_email": {"$ifNull": ["$candidate.email", None]},
+            "candidate_province": {"$ifNull": ["$candidate.province", None]},
+            "is_expired": {"$lt": ["$expiry_date", today]},
+            # Whole days from today to the date part of expiry_date (null if unparseable)
+            "days_remaining": {"$toInt": {"$divide": [
+                {"$subtract": [
+                    {"$dateFromString": {
+                        "dateString": {"$substrBytes": ["$expiry_date", 0, 10]},
+                        "format": "%Y-%m-%d",
+                        "onError": None
+                    }},
+                    today_start
+                ]},
+                MS_PER_DAY
+            ]}}
+        }},
+        {"$project": {"_id": 0, "candidate": 0}}
+    ]
+    return stream_json_array(db.documents.aggregate(pipeline, batchSize=LIST_BATCH_SIZE), cache)
 
 # ==================== FACILITIES ENDPOINTS ====================
 
@@ -2880,23 +3161,26 @@ async def get_expiring_documents(
 async def get_facilities(
     province: Optional[str] = None,
     facility_type: Optional[str] = None,
+    pagination: Pagination = Depends(),
+    cache: ResponseCache = Depends(cached_response("facilities")),
     current_user: dict = Depends(get_current_user)
 ):
-    query = {}
-    if province:
-        query["province"] = province
-    if facility_type:
-        query["facility_type"] = facility_type
+    cached = cache.response()
+    if cached is not None:
+        return cached
+    
+    query = build_query(province=province, facility_type=facility_type)
     
-    facilities = await db.facilities.find(query, {"_id": 0}).to_list(1000)
-    return facilities
+    cursor = pagination.apply(db.facilities.find(query, {"_id": 0}).batch_size(LIST_BATCH_SIZE))
+    return await pagination.add_total(stream_json_array(cursor, cache), db.facilities, query)
 
-@api_router.post("/facilities")
+@api_router.post("/facilities", dependencies=[invalidates("facilities")])
 async def create_facility(facility: FacilityCreate, current_user: dict = Depends(get_current_user)):
     facility_dict = facility.model_dump()
-    facility_dict["id"] = str(uuid.uuid4())
-    facility_dict["created_at"] = datetime.now(timezone.utc).isoformat()
-    facility_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+    facility_dict["id"] = new_id()
+    now = datetime.now(timezone.utc).isoformat()
+    facility_dict["created_at"] = now
+    facility_dict["updated_at"] = now
     
     await db.facilities.insert_one(facility_dict)
     return serialize_doc(facility_dict)
@@ -2908,19 +3192,22 @@ async def get_facility(facility_id: str, current_user: dict = Depends(get_curren
         raise HTTPException(status_code=404, detail="Facility not found")
     return facility
 
-@api_router.put("/facilities/{facility_id}")
+@api_router.put("/facilities/{facility_id}", dependencies=[invalidates("facilities")])
 async def update_facility(facility_id: str, facility_update: FacilityUpdate, current_user: dict = Depends(get_current_user)):
-    update_data = {k: v for k, v in facility_update.model_dump().items() if v is not None}
+    update_data = facility_update.model_dump(exclude_none=True)
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     
-    result = await db.facilities.update_one({"id": facility_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    facility = await db.facilities.find_one_and_update(
+        {"id": facility_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if facility is None:
         raise HTTPException(status_code=404, detail="Facility not found")
-    
-    facility = await db.facilities.find_one({"id": facility_id}, {"_id": 0})
     return facility
 
-@api_router.delete("/facilities/{facility_id}")
+@api_router.delete("/facilities/{facility_id}", dependencies=[invalidates("facilities")])
 async def delete_facility(facility_id: str, current_user: dict = Depends(get_current_user)):
     result = await db.facilities.delete_one({"id": facility_id})
     if result.deleted_count == 0:
@@ -2934,33 +3221,44 @@ async def get_job_orders(
     status: Optional[str] = None,
     facility_id: Optional[str] = None,
     specialty: Optional[str] = None,
+    pagination: Pagination = Depends(),
+    cache: ResponseCache = Depends(cached_response("job_orders", "facilities")),
     current_user: dict = Depends(get_current_user)
 ):
-    query = {}
-    if status:
-        query["status"] = status
-    if facility_id:
-        query["facility_id"] = facility_id
-    if specialty:
-        query["specialty"] = specialty
-    
-    job_orders = await db.job_orders.find(query, {"_id": 0}).to_list(1000)
+    cached = cache.response()
+    if cached is not None:
+        return cached
     
-    # Enrich with facility names
-    for jo in job_orders:
-        facility = await db.facilities.find_one({"id": jo["facility_id"]}, {"_id": 0, "name": 1})
-        jo["facility_name"] = facility["name"] if facility else "Unknown"
+    query = build_query(status=status, facility_id=facility_id, specialty=specialty)
     
-    return job_orders
+    # Enrich with facility names in the same round-trip
+    pipeline = [
+        {"$match": query},
+        *([{"$sort": {"created_at": -1}}, {"$skip": pagination.skip}] if pagination.page else []),
+        {"$limit": pagination.limit},
+        {"$lookup": {
+            "from": "facilities",
+            "localField": "facility_id",
+            "foreignField": "id",
+            "as": "facility"
+        }},
+        {"$addFields": {
+            "facility_name": {"$ifNull": [{"$arrayElemAt": ["$facility.name", 0]}, "Unknown"]}
+        }},
+        {"$project": {"_id": 0, "facility": 0}}
+    ]
+    cursor = db.job_orders.aggregate(pipeline, batchSize=LIST_BATCH_SIZE)
+    return await pagination.add_total(stream_json_array(cursor, cache), db.job_orders, query)
 
-@api_router.post("/job-orders")
+@api_router.post("/job-orders", dependencies=[invalidates("job_orders")])
 async def create_job_order(job_order: JobOrderCreate, current_user: dict = Depends(get_current_user)):
     job_order_dict = job_order.model_dump()
-    job_order_dict["id"] = str(uuid.uuid4())
+    job_order_dict["id"] = new_id()
     job_order_dict["status"] = "Open"
     job_order_dict["shortlisted_candidates"] = []
-    job_order_dict["created_at"] = datetime.now(timezone.utc).isoformat()
-    job_order_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+    now = datetime.now(timezone.utc).isoformat()
+    job_order_dict["created_at"] = now
+    job_order_dict["updated_at"] = now
     
     await db.job_orders.insert_one(job_order_dict)
     return serialize_doc(job_order_dict)
@@ -2976,26 +3274,29 @@ async def get_job_order(job_order_id: str, current_user: dict = Depends(get_curr
     
     return job_order
 
-@api_router.put("/job-orders/{job_order_id}")
+@api_router.put("/job-orders/{job_order_id}", dependencies=[invalidates("job_orders")])
 async def update_job_order(job_order_id: str, job_order_update: JobOrderUpdate, current_user: dict = Depends(get_current_user)):
-    update_data = {k: v for k, v in job_order_update.model_dump().items() if v is not None}
+    update_data = job_order_update.model_dump(exclude_none=True)
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     
-    result = await db.job_orders.update_one({"id": job_order_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    job_order = await db.job_orders.find_one_and_update(
+        {"id": job_order_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if job_order is None:
         raise HTTPException(status_code=404, detail="Job order not found")
-    
-    job_order = await db.job_orders.find_one({"id": job_order_id}, {"_id": 0})
     return job_order
 
-@api_router.delete("/job-orders/{job_order_id}")
+@api_router.delete("/job-orders/{job_order_id}", dependencies=[invalidates("job_orders")])
 async def delete_job_order(job_order_id: str, current_user: dict = Depends(get_current_user)):
     result = await db.job_orders.delete_one({"id": job_order_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Job order not found")
     return {"message": "Job order deleted successfully"}
 
-@api_router.post("/job-orders/{job_order_id}/candidates/{candidate_id}")
+@api_router.post("/job-orders/{job_order_id}/candidates/{candidate_id}", dependencies=[invalidates("job_orders")])
 async def add_candidate_to_job_order(job_order_id: str, candidate_id: str, current_user: dict = Depends(get_current_user)):
     """Add a candidate to job order shortlist"""
     result = await db.job_orders.update_one(
@@ -3006,7 +3307,7 @@ async def add_candidate_to_job_order(job_order_id: str, candidate_id: str, curre
         raise HTTPException(status_code=404, detail="Job order not found")
     return {"message": "Candidate added to shortlist"}
 
-@api_router.delete("/job-orders/{job_order_id}/candidates/{candidate_id}")
+@api_router.delete("/job-orders/{job_order_id}/candidates/{candidate_id}", dependencies=[invalidates("job_orders")])
 async def remove_candidate_from_job_order(job_order_id: str, candidate_id: str, current_user: dict = Depends(get_current_user)):
     """Remove a candidate from job order shortlist"""
     result = await db.job_orders.update_one(
@@ -3024,57 +3325,77 @@ async def get_assignments(
     status: Optional[str] = None,
     candidate_id: Optional[str] = None,
     facility_id: Optional[str] = None,
+    pagination: Pagination = Depends(),
     current_user: dict = Depends(get_current_user)
 ):
-    query = {}
-    if status:
-        query["status"] = status
-    if candidate_id:
-        query["candidate_id"] = candidate_id
-    if facility_id:
-        query["facility_id"] = facility_id
-    
-    assignments = await db.assignments.find(query, {"_id": 0}).to_list(1000)
-    
-    # Enrich with candidate and facility names
-    for a in assignments:
-        candidate = await db.candidates.find_one({"id": a["candidate_id"]}, {"_id": 0, "first_name": 1, "last_name": 1})
-        facility = await db.facilities.find_one({"id": a["facility_id"]}, {"_id": 0, "name": 1})
-        a["candidate_name"] = f"{candidate['first_name']} {candidate['last_name']}" if candidate else "Unknown"
-        a["facility_name"] = facility["name"] if facility else "Unknown"
-        
-        # Check for credential warnings
-        a["credential_warnings"] = await check_credential_warnings(a["candidate_id"], a["end_date"])
+    query = build_query(status=status, candidate_id=candidate_id, facility_id=facility_id)
     
-    return assignments
+    # Enrich with candidate/facility names and credential warnings in one round-trip
+    pipeline = [
+        {"$match": query},
+        *pagination.stages(),
+        {"$lookup": {
+            "from": "candidates",
+            "localField": "candidate_id",
+            "foreignField": "id",
+            "as": "candidate"
+        }},
+        {"$lookup": {
+            "from": "facilities",
+            "localField": "facility_id",
+            "foreignField": "id",
+            "as": "facility"
+        }},
+        # Credentials that expire before the assignment ends (same rule as check_credential_warnings)
+        {"$lookup": {
+            "from": "documents",
+            "let": {"candidate_id": "$candidate_id", "end_date": "$end_date"},
+            "pipeline": [
+                {"$match": {"$expr": {"$and": [
+                    {"$eq": ["$candidate_id", "$$candidate_id"]},
+                    {"$gt": ["$expiry_date", ""]},
+                    {"$lt": ["$expiry_date", "$$end_date"]}
+                ]}}},
+                {"$limit": 100},
+                {"$project": {"_id": 0, "document_type": 1, "expiry_date": 1}}
+            ],
+            "as": "credential_warnings"
+        }},
+        {"$addFields": {
+            "candidate": {"$arrayElemAt": ["$candidate", 0]},
+            "facility_name": {"$ifNull": [{"$arrayElemAt": ["$facility.name", 0]}, "Unknown"]}
+        }},
+        {"$addFields": {
+            "candidate_name": {"$cond": [
+                {"$ifNull": ["$candidate", False]},
+                {"$concat": ["$candidate.first_name", " ", "$candidate.last_name"]},
+                "Unknown"
+            ]}
+        }},
+        {"$project": {"_id": 0, "candidate": 0, "facility": 0}}
+    ]
+    cursor = db.assignments.aggregate(pipeline, batchSize=LIST_BATCH_SIZE)
+    return await pagination.add_total(stream_json_array(cursor), db.assignments, query)
 
 async def check_credential_warnings(candidate_id: str, assignment_end_date: str):
     """Check if any credentials expire during assignment"""
-    documents = await db.documents.find(
-        {"candidate_id": candidate_id, "expiry_date": {"$ne": None}},
-        {"_id": 0}
+    # Empty expiry dates sort below any date string, hence the $gt bound
+    return await db.documents.find(
+        {"candidate_id": candidate_id, "expiry_date": {"$gt": "", "$lt": assignment_end_date}},
+        {"_id": 0, "document_type": 1, "expiry_date": 1}
     ).to_list(100)
-    
-    warnings = []
-    for doc in documents:
-        if doc.get("expiry_date") and doc["expiry_date"] < assignment_end_date:
-            warnings.append({
-                "document_type": doc["document_type"],
-                "expiry_date": doc["expiry_date"]
-            })
-    return warnings
 
-@api_router.post("/assignments")
+@api_router.post("/assignments", dependencies=[invalidates("assignments", "candidates")])
 async def create_assignment(assignment: AssignmentCreate, current_user: dict = Depends(get_current_user)):
     assignment_dict = assignment.model_dump()
-    assignment_dict["id"] = str(uuid.uuid4())
+    assignment_dict["id"] = new_id()
     assignment_dict["status"] = "Scheduled"
-    assignment_dict["created_at"] = datetime.now(timezone.utc).isoformat()
-    assignment_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+    now = datetime.now(timezone.utc).isoformat()
+    assignment_dict["created_at"] = now
+    assignment_dict["updated_at"] = now
     
+    # The candidate is only marked as on assignment once the insert succeeded
     await db.assignments.insert_one(assignment_dict)
-    
-    # Update candidate status
     await db.candidates.update_one(
         {"id": assignment.candidate_id},
         {"$set": {"status": "On Assignment"}}
@@ -3088,27 +3409,32 @@ async def get_assignment(assignment_id: str, current_user: dict = Depends(get_cu
     if not assignment:
         raise HTTPException(status_code=404, detail="Assignment not found")
     
-    candidate = await db.candidates.find_one({"id": assignment["candidate_id"]}, {"_id": 0, "first_name": 1, "last_name": 1})
-    facility = await db.facilities.find_one({"id": assignment["facility_id"]}, {"_id": 0, "name": 1})
+    candidate, facility, assignment["credential_warnings"] = await asyncio.gather(
+        db.candidates.find_one({"id": assignment["candidate_id"]}, {"_id": 0, "first_name": 1, "last_name": 1}),
+        db.facilities.find_one({"id": assignment["facility_id"]}, {"_id": 0, "name": 1}),
+        check_credential_warnings(assignment["candidate_id"], assignment["end_date"])
+    )
     assignment["candidate_name"] = f"{candidate['first_name']} {candidate['last_name']}" if candidate else "Unknown"
     assignment["facility_name"] = facility["name"] if facility else "Unknown"
-    assignment["credential_warnings"] = await check_credential_warnings(assignment["candidate_id"], assignment["end_date"])
     
     return assignment
 
-@api_router.put("/assignments/{assignment_id}")
+@api_router.put("/assignments/{assignment_id}", dependencies=[invalidates("assignments")])
 async def update_assignment(assignment_id: str, assignment_update: AssignmentUpdate, current_user: dict = Depends(get_current_user)):
-    update_data = {k: v for k, v in assignment_update.model_dump().items() if v is not None}
+    update_data = assignment_update.model_dump(exclude_none=True)
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     
-    result = await db.assignments.update_one({"id": assignment_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    assignment = await db.assignments.find_one_and_update(
+        {"id": assignment_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if assignment is None:
         raise HTTPException(status_code=404, detail="Assignment not found")
-    
-    assignment = await db.assignments.find_one({"id": assignment_id}, {"_id": 0})
     return assignment
 
-@api_router.delete("/assignments/{assignment_id}")
+@api_router.delete("/assignments/{assignment_id}", dependencies=[invalidates("assignments")])
 async def delete_assignment(assignment_id: str, current_user: dict = Depends(get_current_user)):
     result = await db.assignments.delete_one({"id": assignment_id})
     if result.deleted_count == 0:
@@ -3117,49 +3443,87 @@ async def delete_assignment(assignment_id: str, current_user: dict = Depends(get
 
 # ==================== TIMESHEETS ENDPOINTS ====================
 
-@api_router.get("/timesheets")
-async def get_timesheets(
-    status: Optional[str] = None,
-    candidate_id: Optional[str] = None,
-    assignment_id: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)
-):
-    query = {}
-    if status:
-        query["status"] = status
-    if candidate_id:
-        query["candidate_id"] = candidate_id
-    if assignment_id:
-        query["assignment_id"] = assignment_id
-    
-    timesheets = await db.timesheets.find(query, {"_id": 0}).to_list(1000)
+async def add_timesheet_details(timesheets: List[dict]):
+    """Add candidate names and assignment billing fields to a batch of timesheets"""
+    # Batch-fetch the related candidates, assignments and facilities with $in
+    candidate_ids = list({ts["candidate_id"] for ts in timesheets})
+    assignment_ids = list({ts["assignment_id"] for ts in timesheets})
+    candidate_list, assignment_list = await asyncio.gather(
+        db.candidates.find(
+            {"id": {"$in": candidate_ids}}, {"_id": 0, "id": 1, "first_name": 1, "last_name": 1}
+        ).to_list(None),
+        db.assignments.find(
+            {"id": {"$in": assignment_ids}},
+            {"_id": 0, "id": 1, "facility_id": 1, "bill_rate": 1, "pay_rate_regular": 1, "pay_rate_ot": 1}
+        ).to_list(None)
+    )
+    candidates = {c["id"]: c for c in candidate_list}
+    assignments = {a["id"]: a for a in assignment_list}
+    facility_ids = list({a.get("facility_id") for a in assignment_list})
+    facilities = {
+        f["id"]: f["name"]
+        async for f in db.facilities.find({"id": {"$in": facility_ids}}, {"_id": 0, "id": 1, "name": 1})
+    }
     
     for ts in timesheets:
-        candidate = await db.candidates.find_one({"id": ts["candidate_id"]}, {"_id": 0, "first_name": 1, "last_name": 1})
+        candidate = candidates.get(ts["candidate_id"])
         ts["candidate_name"] = f"{candidate['first_name']} {candidate['last_name']}" if candidate else "Unknown"
         
         # Get assignment info for billing
-        assignment = await db.assignments.find_one({"id": ts["assignment_id"]}, {"_id": 0})
+        assignment = assignments.get(ts["assignment_id"])
         if assignment:
             ts["facility_id"] = assignment.get("facility_id")
-            facility = await db.facilities.find_one({"id": assignment.get("facility_id")}, {"_id": 0, "name": 1})
-            ts["facility_name"] = facility["name"] if facility else "Unknown"
+            ts["facility_name"] = facilities.get(assignment.get("facility_id"), "Unknown")
             ts["bill_rate"] = assignment.get("bill_rate", 0)
             ts["pay_rate_regular"] = assignment.get("pay_rate_regular", 0)
             ts["pay_rate_ot"] = assignment.get("pay_rate_ot", 0)
+
+async def iter_timesheet_details(cursor):
+    """Yield timesheets from a cursor with their details, looked up one batch at a time"""
+    batch = []
+    async for ts in cursor:
+        batch.append(ts)
+        if len(batch) >= LIST_BATCH_SIZE:
+            await add_timesheet_details(batch)
+            for detailed in batch:
+                yield detailed
+            batch = []
+    if batch:
+        await add_timesheet_details(batch)
+        for detailed in batch:
+            yield detailed
+
+@api_router.get("/timesheets")
+async def get_timesheets(
+    status: Optional[str] = None,
+    candidate_id: Optional[str] = None,
+    assignment_id: Optional[str] = None,
+    pagination: Pagination = Depends(),
+    current_user: dict = Depends(get_current_user)
+):
+    query = build_query(status=status, candidate_id=candidate_id, assignment_id=assignment_id)
     
-    return timesheets
+    cursor = pagination.apply(db.timesheets.find(query, {"_id": 0}).batch_size(LIST_BATCH_SIZE))
+    return await pagination.add_total(
+        stream_json_array(iter_timesheet_details(cursor)), db.timesheets, query
+    )
 
-@api_router.post("/timesheets")
+def sum_timesheet_hours(entries: List[dict]) -> tuple:
+    """Total (regular, overtime) hours across dumped timesheet entries in one pass"""
+    total_regular = total_ot = 0.0
+    for e in entries:
+        total_regular += e.get("regular_hours") or 0
+        total_ot += e.get("ot_hours") or 0
+    return total_regular, total_ot
+
+@api_router.post("/timesheets", dependencies=[invalidates("timesheets")])
 async def create_timesheet(timesheet: TimesheetCreate, current_user: dict = Depends(get_current_user)):
     timesheet_dict = timesheet.model_dump()
-    timesheet_dict["id"] = str(uuid.uuid4())
+    timesheet_dict["id"] = new_id()
     timesheet_dict["status"] = "Draft"
-    timesheet_dict["entries"] = [e.model_dump() if hasattr(e, 'model_dump') else e for e in timesheet.entries]
     
-    # Calculate totals
-    total_regular = sum(e.get("regular_hours", 0) if isinstance(e, dict) else e.regular_hours for e in timesheet_dict["entries"])
-    total_ot = sum(e.get("ot_hours", 0) if isinstance(e, dict) else e.ot_hours for e in timesheet_dict["entries"])
+    # Calculate totals (model_dump has already turned entries into dicts)
+    total_regular, total_ot = sum_timesheet_hours(timesheet_dict["entries"])
     timesheet_dict["total_regular_hours"] = total_regular
     timesheet_dict["total_ot_hours"] = total_ot
     timesheet_dict["total_hours"] = total_regular + total_ot
@@ -3172,8 +3536,9 @@ async def create_timesheet(timesheet: TimesheetCreate, current_user: dict = Depe
     else:
         timesheet_dict["total_billable"] = 0
     
-    timesheet_dict["created_at"] = datetime.now(timezone.utc).isoformat()
-    timesheet_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+    now = datetime.now(timezone.utc).isoformat()
+    timesheet_dict["created_at"] = now
+    timesheet_dict["updated_at"] = now
     
     await db.timesheets.insert_one(timesheet_dict)
     return serialize_doc(timesheet_dict)
@@ -3185,29 +3550,29 @@ async def get_timesheet(timesheet_id: str, current_user: dict = Depends(get_curr
         raise HTTPException(status_code=404, detail="Timesheet not found")
     return timesheet
 
-@api_router.put("/timesheets/{timesheet_id}")
+@api_router.put("/timesheets/{timesheet_id}", dependencies=[invalidates("timesheets")])
 async def update_timesheet(timesheet_id: str, timesheet_update: TimesheetUpdate, current_user: dict = Depends(get_current_user)):
-    update_data = {k: v for k, v in timesheet_update.model_dump().items() if v is not None}
+    update_data = timesheet_update.model_dump(exclude_none=True)
     
     if "entries" in update_data:
-        entries = update_data["entries"]
-        total_regular = sum(e.get("regular_hours", 0) if isinstance(e, dict) else e.regular_hours for e in entries)
-        total_ot = sum(e.get("ot_hours", 0) if isinstance(e, dict) else e.ot_hours for e in entries)
+        total_regular, total_ot = sum_timesheet_hours(update_data["entries"])
         update_data["total_regular_hours"] = total_regular
         update_data["total_ot_hours"] = total_ot
         update_data["total_hours"] = total_regular + total_ot
-        update_data["entries"] = [e.model_dump() if hasattr(e, 'model_dump') else e for e in entries]
     
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     
-    result = await db.timesheets.update_one({"id": timesheet_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    timesheet = await db.timesheets.find_one_and_update(
+        {"id": timesheet_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if timesheet is None:
         raise HTTPException(status_code=404, detail="Timesheet not found")
-    
-    timesheet = await db.timesheets.find_one({"id": timesheet_id}, {"_id": 0})
     return timesheet
 
-@api_router.post("/timesheets/{timesheet_id}/submit")
+@api_router.post("/timesheets/{timesheet_id}/submit", dependencies=[invalidates("timesheets")])
 async def submit_timesheet(timesheet_id: str, current_user: dict = Depends(get_current_user)):
     result = await db.timesheets.update_one(
         {"id": timesheet_id},
@@ -3217,7 +3582,7 @@ async def submit_timesheet(timesheet_id: str, current_user: dict = Depends(get_c
         raise HTTPException(status_code=404, detail="Timesheet not found")
     return {"message": "Timesheet submitted"}
 
-@api_router.post("/timesheets/{timesheet_id}/approve")
+@api_router.post("/timesheets/{timesheet_id}/approve", dependencies=[invalidates("timesheets")])
 async def approve_timesheet(timesheet_id: str, current_user: dict = Depends(get_current_user)):
     result = await db.timesheets.update_one(
         {"id": timesheet_id},
@@ -3236,19 +3601,15 @@ async def get_activities(
     limit: int = Query(default=50, le=200),
     current_user: dict = Depends(get_current_user)
 ):
-    query = {}
-    if entity_type:
-        query["entity_type"] = entity_type
-    if entity_id:
-        query["entity_id"] = entity_id
+    query = build_query(entity_type=entity_type, entity_id=entity_id)
     
-    activities = await db.activities.find(query, {"_id": 0}).sort("created_at", -1).to_list(limit)
+    activities = await db.activities.find(query, {"_id": 0}).sort("created_at", -1).limit(limit).to_list(limit)
     return activities
 
 @api_router.post("/activities")
 async def create_activity(activity: ActivityCreate, current_user: dict = Depends(get_current_user)):
     activity_dict = activity.model_dump()
-    activity_dict["id"] = str(uuid.uuid4())
+    activity_dict["id"] = new_id()
     activity_dict["user_id"] = current_user["id"]
     activity_dict["created_at"] = datetime.now(timezone.utc).isoformat()
     
@@ -3257,53 +3618,68 @@ async def create_activity(activity: ActivityCreate, current_user: dict = Depends
 
 # ==================== DASHBOARD ENDPOINTS ====================
 
+# Collections counted by the dashboard; a write to any other leaves the cached stats alone
+DASHBOARD_COLLECTIONS = ("leads", "candidates", "documents", "facilities", "job_orders", "assignments", "timesheets")
+
 @api_router.get("/dashboard/stats")
-async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
-    # Leads by stage
-    pipeline_stages = ["New Lead", "Contacted", "Screening Scheduled", "Application Submitted", "Interview", "Offer", "Hired", "Rejected"]
-    leads_by_stage = {}
-    for stage in pipeline_stages:
-        count = await db.leads.count_documents({"stage": stage})
-        leads_by_stage[stage] = count
-    
-    # Active candidates by specialty
-    candidates_pipeline = [
-        {"$match": {"status": "Active"}},
-        {"$group": {"_id": "$primary_specialty", "count": {"$sum": 1}}}
-    ]
-    specialty_counts = await db.candidates.aggregate(candidates_pipeline).to_list(100)
-    candidates_by_specialty = {item["_id"] or "Unspecified": item["count"] for item in specialty_counts}
-    
-    # Open job orders
-    open_job_orders = await db.job_orders.count_documents({"status": "Open"})
-    
-    # Assignments starting in next 14-30 days
-    today = datetime.now(timezone.utc).isoformat()
-    in_14_days = (datetime.now(timezone.utc) + timedelta(days=14)).isoformat()
-    in_30_days = (datetime.now(timezone.utc) + timedelta(days=30)).isoformat()
+async def get_dashboard_stats(
+    cache: ResponseCache = Depends(cached_response(*DASHBOARD_COLLECTIONS)),
+    current_user: dict = Depends(get_current_user)
+):
+    cached = cache.response()
+    if cached is not None:
+        return cached
     
-    assignments_next_14 = await db.assignments.count_documents({
-        "start_date": {"$gte": today, "$lte": in_14_days}
-    })
-    assignments_next_30 = await db.assignments.count_documents({
-        "start_date": {"$gte": today, "$lte": in_30_days}
-    })
+    pipeline_stages = ["New Lead", "Contacted", "Screening Scheduled", "Application Submitted", "Interview", "Offer", "Hired", "Rejected"]
     
-    # Credentials expiring soon (30 days)
-    expiring_30 = await db.documents.count_documents({
-        "expiry_date": {"$gte": today, "$lte": in_30_days}
-    })
+    now = datetime.now(timezone.utc)
+    today = now.isoformat()
+    in_14_days = (now + timedelta(days=14)).isoformat()
+    in_30_days = (now + timedelta(days=30)).isoformat()
+    
+    # Independent queries run concurrently over the connection pool
+    (
+        stage_counts,
+        specialty_counts,
+        open_job_orders,
+        assignments_next_14,
+        assignments_next_30,
+        expiring_30,
+        total_candidates,
+        active_candidates,
+        total_facilities,
+        total_job_orders,
+        active_assignments,
+        pending_timesheets,
+    ) = await asyncio.gather(
+        # Leads by stage (one $group instead of a count per stage)
+        db.leads.aggregate([{"$group": {"_id": "$stage", "count": {"$sum": 1}}}]).to_list(None),
+        # Active candidates by specialty
+        db.candidates.aggregate([
+            {"$match": {"status": "Active"}},
+            {"$group": {"_id": "$primary_specialty", "count": {"$sum": 1}}}
+        ]).to_list(100),
+        db.job_orders.count_documents({"status": "Open"}),
+        # Assignments starting in next 14-30 days
+        db.assignments.count_documents({"start_date": {"$gte": today, "$lte": in_14_days}}),
+        db.assignments.count_documents({"start_date": {"$gte": today, "$lte": in_30_days}}),
+        # Credentials expiring soon (30 days)
+        db.documents.count_documents({"expiry_date": {"$gte": today, "$lte": in_30_days}}),
+        # Total counts (unfiltered totals come from collection metadata)
+        db.candidates.estimated_document_count(),
+        db.candidates.count_documents({"status": "Active"}),
+        db.facilities.estimated_document_count(),
+        db.job_orders.estimated_document_count(),
+        db.assignments.count_documents({"status": "Active"}),
+        db.timesheets.count_documents({"status": "Submitted"}),
+    )
     
-    # Total counts
-    total_leads = await db.leads.count_documents({})
-    total_candidates = await db.candidates.count_documents({})
-    active_candidates = await db.candidates.count_documents({"status": "Active"})
-    total_facilities = await db.facilities.count_documents({})
-    total_job_orders = await db.job_orders.count_documents({})
-    active_assignments = await db.assignments.count_documents({"status": "Active"})
-    pending_timesheets = await db.timesheets.count_documents({"status": "Submitted"})
+    stage_totals = {item["_id"]: item["count"] for item in stage_counts}
+    leads_by_stage = {stage: stage_totals.get(stage, 0) for stage in pipeline_stages}
+    total_leads = sum(stage_totals.values())
+    candidates_by_specialty = {item["_id"] or "Unspecified": item["count"] for item in specialty_counts}
     
-    return {
+    stats = {
         "leads_by_stage": leads_by_stage,
         "candidates_by_specialty": candidates_by_specialty,
         "open_job_orders": open_job_orders,
@@ -3318,10 +3694,13 @@ async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
         "active_assignments": active_assignments,
         "pending_timesheets": pending_timesheets
     }
+    body = orjson.dumps(stats)
+    cache.store(body, ttl=DASHBOARD_CACHE_TTL)
+    return Response(body, media_type="application/json")
 
 @api_router.get("/dashboard/recent-activities")
 async def get_recent_activities(current_user: dict = Depends(get_current_user)):
-    activities = await db.activities.find({}, {"_id": 0}).sort("created_at", -1).to_list(10)
+    activities = await db.activities.find({}, {"_id": 0}).sort("created_at", -1).limit(10).to_list(10)
     return activities
 
 # ==================== INVOICES ENDPOINTS (Basic) ====================
@@ -3329,51 +3708,67 @@ async def get_recent_activities(current_user: dict = Depends(get_current_user)):
 @api_router.get("/invoices")
 async def get_invoices(current_user: dict = Depends(get_current_user)):
     """Get billing data aggregated by facility and period"""
-    timesheets = await db.timesheets.find({"status": "Approved"}, {"_id": 0}).to_list(1000)
-    
-    # Group by facility and period
-    invoice_data = {}
-    for ts in timesheets:
-        assignment = await db.assignments.find_one({"id": ts["assignment_id"]}, {"_id": 0})
-        if not assignment:
-            continue
-        
-        facility_id = assignment.get("facility_id")
-        facility = await db.facilities.find_one({"id": facility_id}, {"_id": 0, "name": 1})
-        
-        key = f"{facility_id}_{ts['week_start'][:7]}"  # facility_YYYY-MM
-        if key not in invoice_data:
-            invoice_data[key] = {
-                "facility_id": facility_id,
-                "facility_name": facility["name"] if facility else "Unknown",
-                "period": ts["week_start"][:7],
-                "total_hours": 0,
-                "total_amount": 0,
-                "timesheets": []
-            }
-        
-        invoice_data[key]["total_hours"] += ts.get("total_hours", 0)
-        invoice_data[key]["total_amount"] += ts.get("total_billable", 0)
-        invoice_data[key]["timesheets"].append(ts["id"])
-    
-    return list(invoice_data.values())
+    # Join each approved timesheet to its assignment's facility and total by
+    # facility and month (week_start YYYY-MM) in one round-trip. Timesheets
+    # whose assignment no longer exists are dropped by the $unwind.
+    pipeline = [
+        {"$match": {"status": "Approved"}},
+        {"$limit": 1000},
+        {"$lookup": {
+            "from": "assignments",
+            "localField": "assignment_id",
+            "foreignField": "id",
+            "as": "assignment",
+        }},
+        {"$unwind": "$assignment"},
+        {"$lookup": {
+            "from": "facilities",
+            "localField": "assignment.facility_id",
+            "foreignField": "id",
+            "as": "facility",
+        }},
+        {"$group": {
+            "_id": {
+                "facility_id": {"$ifNull": ["$assignment.facility_id", None]},
+                "period": {"$substrBytes": ["$week_start", 0, 7]},
+            },
+            "facility_name": {"$first": {"$arrayElemAt": ["$facility.name", 0]}},
+            "total_hours": {"$sum": "$total_hours"},
+            "total_amount": {"$sum": "$total_billable"},
+            "timesheets": {"$push": "$id"},
+        }},
+        {"$sort": {"_id.period": 1, "facility_name": 1}},
+        {"$project": {
+            "_id": 0,
+            "facility_id": "$_id.facility_id",
+            "facility_name": {"$ifNull": ["$facility_name", "Unknown"]},
+            "period": "$_id.period",
+            "total_hours": 1,
+            "total_amount": 1,
+            "timesheets": 1,
+        }},
+    ]
+    return stream_json_array(db.timesheets.aggregate(pipeline, batchSize=LIST_BATCH_SIZE))
 
 # ==================== DOCUMENT TYPES ====================
 
+# Static, so encoded once at import rather than on every request
+DOCUMENT_TYPES_JSON = orjson.dumps([
+    {"id": "nursing_license", "name": "Nursing License", "required": True},
+    {"id": "crc", "name": "Criminal Record Check", "required": True},
+    {"id": "immunization", "name": "Immunization Records", "required": True},
+    {"id": "bls_acls", "name": "BLS/ACLS Certification", "required": True},
+    {"id": "references", "name": "Professional References", "required": False},
+    {"id": "resume", "name": "Resume/CV", "required": False},
+    {"id": "employment_contract", "name": "Employment Contract", "required": False},
+    {"id": "id_document", "name": "Government ID", "required": True},
+    {"id": "work_permit", "name": "Work Permit", "required": False},
+    {"id": "other", "name": "Other", "required": False}
+])
+
 @api_router.get("/document-types")
 async def get_document_types(current_user: dict = Depends(get_current_user)):
-    return [
-        {"id": "nursing_license", "name": "Nursing License", "required": True},
-        {"id": "crc", "name": "Criminal Record Check", "required": True},
-        {"id": "immunization", "name": "Immunization Records", "required": True},
-        {"id": "bls_acls", "name": "BLS/ACLS Certification", "required": True},
-        {"id": "references", "name": "Professional References", "required": False},
-        {"id": "resume", "name": "Resume/CV", "required": False},
-        {"id": "employment_contract", "name": "Employment Contract", "required": False},
-        {"id": "id_document", "name": "Government ID", "required": True},
-        {"id": "work_permit", "name": "Work Permit", "required": False},
-        {"id": "other", "name": "Other", "required": False}
-    ]
+    return Response(content=DOCUMENT_TYPES_JSON, media_type="application/json")
 
 # ==================== NOTIFICATIONS ====================
 
@@ -3411,7 +3806,7 @@ async def update_notification_settings(
     if current_user["role"] not in ["Admin"]:
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    update_data = {k: v for k, v in settings.model_dump().items() if v is not None}
+    update_data = settings.model_dump(exclude_none=True)
     return await notification_service.update_settings(update_data)
 
 @api_router.get("/notifications")
@@ -3450,7 +3845,7 @@ async def mark_all_notifications_read(current_user: dict = Depends(get_current_u
     count = await notification_service.mark_all_as_read(current_user["id"])
     return {"message": f"Marked {count} notifications as read", "count": count}
 
-@api_router.post("/notifications/check-expiring-credentials")
+@api_router.post("/notifications/check-expiring-credentials", dependencies=[invalidates("documents")])
 async def check_expiring_credentials(current_user: dict = Depends(get_current_user)):
     """Manually trigger expiring credential check (Admin only)"""
     if current_user["role"] not in ["Admin", "Compliance Officer"]:
@@ -3476,39 +3871,24 @@ async def get_notification_logs(
 
 # ==================== SEED DATA ENDPOINT ====================
 
-@api_router.post("/seed")
-async def seed_database():
-    """Seed the database with demo data"""
-    # Clear existing data
-    await db.users.delete_many({})
-    await db.leads.delete_many({})
-    await db.candidates.delete_many({})
-    await db.documents.delete_many({})
-    await db.facilities.delete_many({})
-    await db.job_orders.delete_many({})
-    await db.assignments.delete_many({})
-    await db.timesheets.delete_many({})
-    await db.activities.delete_many({})
-    await db.lead_capture_settings.delete_many({})
-    await db.lead_audit_logs.delete_many({})
-    
-    now = datetime.now(timezone.utc)
+def build_seed_data(now: datetime, password_hashes: dict) -> dict:
+    """Build every demo document, keyed by collection name (no I/O)"""
+    now_iso = now.isoformat()
     
     # Create users with different roles
     users = [
-        {"id": str(uuid.uuid4()), "email": "admin@mccareglobal.com", "password": hash_password("admin123"), "first_name": "Sarah", "last_name": "Johnson", "role": "Admin", "created_at": now.isoformat()},
-        {"id": str(uuid.uuid4()), "email": "recruiter@mccareglobal.com", "password": hash_password("recruiter123"), "first_name": "Michael", "last_name": "Chen", "role": "Recruiter", "created_at": now.isoformat()},
-        {"id": str(uuid.uuid4()), "email": "compliance@mccareglobal.com", "password": hash_password("compliance123"), "first_name": "Emily", "last_name": "Williams", "role": "Compliance Officer", "created_at": now.isoformat()},
-        {"id": str(uuid.uuid4()), "email": "scheduler@mccareglobal.com", "password": hash_password("scheduler123"), "first_name": "David", "last_name": "Brown", "role": "Scheduler", "created_at": now.isoformat()},
-        {"id": str(uuid.uuid4()), "email": "finance@mccareglobal.com", "password": hash_password("finance123"), "first_name": "Jennifer", "last_name": "Davis", "role": "Finance", "created_at": now.isoformat()},
-        {"id": str(uuid.uuid4()), "email": "nurse@mccareglobal.com", "password": hash_password("nurse123"), "first_name": "Amanda", "last_name": "Smith", "role": "Nurse", "created_at": now.isoformat()},
+        {"id": new_id(), "email": "admin@mccareglobal.com", "password": password_hashes["admin123"], "first_name": "Sarah", "last_name": "Johnson", "role": "Admin", "created_at": now_iso},
+        {"id": new_id(), "email": "recruiter@mccareglobal.com", "password": password_hashes["recruiter123"], "first_name": "Michael", "last_name": "Chen", "role": "Recruiter", "created_at": now_iso},
+        {"id": new_id(), "email": "compliance@mccareglobal.com", "password": password_hashes["compliance123"], "first_name": "Emily", "last_name": "Williams", "role": "Compliance Officer", "created_at": now_iso},
+        {"id": new_id(), "email": "scheduler@mccareglobal.com", "password": password_hashes["scheduler123"], "first_name": "David", "last_name": "Brown", "role": "Scheduler", "created_at": now_iso},
+        {"id": new_id(), "email": "finance@mccareglobal.com", "password": password_hashes["finance123"], "first_name": "Jennifer", "last_name": "Davis", "role": "Finance", "created_at": now_iso},
+        {"id": new_id(), "email": "nurse@mccareglobal.com", "password": password_hashes["nurse123"], "first_name": "Amanda", "last_name": "Smith", "role": "Nurse", "created_at": now_iso},
     ]
-    await db.users.insert_many(users)
     recruiter_id = users[1]["id"]
     
     # Create lead capture settings
     lead_capture_settings = {
-        "id": str(uuid.uuid4()),
+        "id": new_id(),
         "required_fields": ["first_name", "last_name", "email"],
         "optional_fields": ["phone", "specialty", "province_preference", "notes"],
         "default_pipeline_stage": "New Lead",
@@ -3524,10 +3904,9 @@ async def seed_database():
         "auto_convert_to_candidate": False,
         "notify_on_new_lead": True,
         "allowed_sources": ["ATS Form", "API", "HubSpot", "Website", "Landing Page", "Direct", "LinkedIn", "Referral", "Job Board", "Career Fair"],
-        "created_at": now.isoformat(),
-        "updated_at": now.isoformat()
+        "created_at": now_iso,
+        "updated_at": now_iso
     }
-    await db.lead_capture_settings.insert_one(lead_capture_settings)
     
     # Create leads with diverse sources
     stages = ["New Lead", "Contacted", "Screening Scheduled", "Application Submitted", "Interview", "Offer"]
@@ -3545,7 +3924,7 @@ async def seed_database():
     ]
     
     for i, (first, last) in enumerate(lead_names):
-        lead_id = str(uuid.uuid4())
+        lead_id = new_id()
         source = sources[i % len(sources)]
         province = provinces[i % len(provinces)]
         specialty = specialties[i % len(specialties)]
@@ -3583,13 +3962,13 @@ async def seed_database():
             "form_id": f"form-{source.lower().replace(' ', '-')}" if source in ["ATS Form", "Landing Page", "HubSpot"] else None,
             "hubspot_form_id": f"hs-form-{i}" if source == "HubSpot" else None,
             "created_at": (now - timedelta(days=30-i)).isoformat(),
-            "updated_at": now.isoformat()
+            "updated_at": now_iso
         }
         leads.append(lead)
         
         # Create audit log for each lead
         lead_audit_logs.append({
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "lead_id": lead_id,
             "source": source,
             "timestamp": (now - timedelta(days=30-i)).isoformat(),
@@ -3608,8 +3987,6 @@ async def seed_database():
             "auto_converted": False
         })
     
-    await db.leads.insert_many(leads)
-    await db.lead_audit_logs.insert_many(lead_audit_logs)
     
     # Create candidates
     candidates = []
@@ -3628,7 +4005,7 @@ async def seed_database():
     
     for i, (first, last, nurse_type, specialty, province) in enumerate(candidate_names):
         candidates.append({
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "first_name": first,
             "last_name": last,
             "preferred_name": first,
@@ -3650,9 +4027,8 @@ async def seed_database():
             "tags": ["travel-nurse", specialty.lower()],
             "notes": f"Experienced {specialty} nurse with {3+(i%10)} years experience",
             "created_at": (now - timedelta(days=60-i*5)).isoformat(),
-            "updated_at": now.isoformat()
+            "updated_at": now_iso
         })
-    await db.candidates.insert_many(candidates)
     
     # Create documents for candidates
     document_types = ["Nursing License", "Criminal Record Check", "Immunization Records", "BLS/ACLS", "Resume", "References"]
@@ -3662,7 +4038,7 @@ async def seed_database():
         for j, doc_type in enumerate(document_types):
             expiry_days = 365 - (j * 60) + (candidates.index(candidate) * 10)  # Vary expiry dates
             documents.append({
-                "id": str(uuid.uuid4()),
+                "id": new_id(),
                 "candidate_id": candidate["id"],
                 "document_type": doc_type,
                 "file_url": f"https://storage.mccareglobal.com/docs/{candidate['id']}/{doc_type.lower().replace(' ', '_')}.pdf",
@@ -3672,9 +4048,8 @@ async def seed_database():
                 "verified_by": users[2]["id"] if j < 3 else None,
                 "notes": None,
                 "created_at": (now - timedelta(days=60)).isoformat(),
-                "updated_at": now.isoformat()
+                "updated_at": now_iso
             })
-    await db.documents.insert_many(documents)
     
     # Create facilities
     facilities = [
@@ -3687,18 +4062,17 @@ async def seed_database():
     ]
     
     for i, facility in enumerate(facilities):
-        facility["id"] = str(uuid.uuid4())
+        facility["id"] = new_id()
         facility["address"] = f"{200+i*10} Medical Boulevard"
         facility["billing_notes"] = "Net 30 payment terms"
-        facility["created_at"] = now.isoformat()
-        facility["updated_at"] = now.isoformat()
-    await db.facilities.insert_many(facilities)
+        facility["created_at"] = now_iso
+        facility["updated_at"] = now_iso
     
     # Create job orders
     job_orders = []
     for i, facility in enumerate(facilities[:4]):
         job_orders.append({
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "facility_id": facility["id"],
             "role": "Registered Nurse",
             "specialty": specialties[i % len(specialties)],
@@ -3714,15 +4088,14 @@ async def seed_database():
             "shortlisted_candidates": [candidates[i]["id"]] if i < len(candidates) else [],
             "notes": f"Urgent need for {specialties[i % len(specialties)]} nurses",
             "created_at": (now - timedelta(days=14-i*3)).isoformat(),
-            "updated_at": now.isoformat()
+            "updated_at": now_iso
         })
-    await db.job_orders.insert_many(job_orders)
     
     # Create assignments
     assignments = []
     for i in range(3):
         assignments.append({
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "candidate_id": candidates[i]["id"],
             "job_order_id": job_orders[i]["id"],
             "facility_id": facilities[i]["id"],
@@ -3738,29 +4111,31 @@ async def seed_database():
             "status": "Active",
             "notes": "13-week travel contract",
             "created_at": (now - timedelta(days=30-i*10)).isoformat(),
-            "updated_at": now.isoformat()
+            "updated_at": now_iso
         })
-    await db.assignments.insert_many(assignments)
     
-    # Create timesheets
+    # Create timesheets (three weeks back from today; days_ago[n] is n days before now)
+    days_ago = [(now - timedelta(days=n)).strftime("%Y-%m-%d") for n in range(22)]
+    # Every seeded week has the same hours: 8h Mon-Thu and 4h Fri, plus 2h OT Thu-Fri
+    regular_hours = (8.0, 8.0, 8.0, 8.0, 4.0)
+    ot_hours = (0.0, 0.0, 0.0, 2.0, 2.0)
+    total_regular = sum(regular_hours)
+    total_ot = sum(ot_hours)
+    timesheet_ids = iter(new_ids(len(assignments) * 3))
     timesheets = []
     for i, assignment in enumerate(assignments):
+        # Hours are the same every week, and so is the billable amount
+        weekly_billable = (total_regular * assignment["bill_rate"]) + (total_ot * assignment["bill_rate"] * 1.5)
         for week in range(3):
-            week_start = (now - timedelta(days=21-week*7)).strftime("%Y-%m-%d")
-            week_end = (now - timedelta(days=15-week*7)).strftime("%Y-%m-%d")
-            entries = []
-            for day in range(5):  # Mon-Fri
-                entries.append({
-                    "day": (now - timedelta(days=21-week*7-day)).strftime("%Y-%m-%d"),
-                    "regular_hours": 8.0 if day < 4 else 4.0,
-                    "ot_hours": 0.0 if day < 3 else 2.0
-                })
-            
-            total_regular = sum(e["regular_hours"] for e in entries)
-            total_ot = sum(e["ot_hours"] for e in entries)
+            week_start = days_ago[21-week*7]
+            week_end = days_ago[15-week*7]
+            entries = [
+                {"day": days_ago[21-week*7-day], "regular_hours": regular_hours[day], "ot_hours": ot_hours[day]}
+                for day in range(5)  # Mon-Fri
+            ]
             
             timesheets.append({
-                "id": str(uuid.uuid4()),
+                "id": next(timesheet_ids),
                 "assignment_id": assignment["id"],
                 "candidate_id": assignment["candidate_id"],
                 "week_start": week_start,
@@ -3769,56 +4144,117 @@ async def seed_database():
                 "total_regular_hours": total_regular,
                 "total_ot_hours": total_ot,
                 "total_hours": total_regular + total_ot,
-                "total_billable": (total_regular * assignment["bill_rate"]) + (total_ot * assignment["bill_rate"] * 1.5),
+                "total_billable": weekly_billable,
                 "status": "Approved" if week < 2 else "Submitted" if week == 2 else "Draft",
                 "notes": None,
                 "created_at": (now - timedelta(days=14-week*7)).isoformat(),
-                "updated_at": now.isoformat()
+                "updated_at": now_iso
             })
-    await db.timesheets.insert_many(timesheets)
     
     # Create activities
-    activities = [
+    activity_templates = [
         {"entity_type": "lead", "entity_id": leads[0]["id"], "activity_type": "created", "description": "New lead added from HubSpot"},
         {"entity_type": "lead", "entity_id": leads[1]["id"], "activity_type": "stage_change", "description": "Stage changed to Contacted"},
         {"entity_type": "candidate", "entity_id": candidates[0]["id"], "activity_type": "document_uploaded", "description": "Nursing license uploaded"},
         {"entity_type": "assignment", "entity_id": assignments[0]["id"], "activity_type": "created", "description": "New assignment created"},
         {"entity_type": "timesheet", "entity_id": timesheets[0]["id"], "activity_type": "approved", "description": "Timesheet approved for processing"},
     ]
+    activities = [
+        {
+            **template,
+            "id": activity_id,
+            "user_id": users[i % len(users)]["id"],
+            "created_at": (now - timedelta(hours=i*2)).isoformat()
+        }
+        for i, (template, activity_id) in enumerate(zip(activity_templates, new_ids(len(activity_templates))))
+    ]
     
-    for i, activity in enumerate(activities):
-        activity["id"] = str(uuid.uuid4())
-        activity["user_id"] = users[i % len(users)]["id"]
-        activity["created_at"] = (now - timedelta(hours=i*2)).isoformat()
-    await db.activities.insert_many(activities)
+    return {
+        "users": users,
+        "leads": leads,
+        "candidates": candidates,
+        "documents": documents,
+        "facilities": facilities,
+        "job_orders": job_orders,
+        "assignments": assignments,
+        "timesheets": timesheets,
+        "activities": activities,
+        "lead_capture_settings": [lead_capture_settings],
+        "lead_audit_logs": lead_audit_logs,
+    }
+
+def encode_seed_data(now: datetime, password_hashes: dict) -> dict:
+    """build_seed_data() with each document pre-encoded to BSON, so insert_many only ships the bytes"""
+    return {
+        name: [RawBSONDocument(bson.encode(doc)) for doc in docs]
+        for name, docs in build_seed_data(now, password_hashes).items()
+    }
+
+# Demo logins returned by /seed, by role
+DEMO_CREDENTIALS = {
+    "admin": {"email": "admin@mccareglobal.com", "password": "admin123"},
+    "recruiter": {"email": "recruiter@mccareglobal.com", "password": "recruiter123"},
+    "compliance": {"email": "compliance@mccareglobal.com", "password": "compliance123"},
+    "scheduler": {"email": "scheduler@mccareglobal.com", "password": "scheduler123"},
+    "finance": {"email": "finance@mccareglobal.com", "password": "finance123"},
+    "nurse": {"email": "nurse@mccareglobal.com", "password": "nurse123"}
+}
+
+# Demo passwords are fixed, so each worker only pays for bcrypt once
+seed_password_hashes = {}
+
+@api_router.post("/seed", dependencies=[invalidates(
+    "leads", "candidates", "documents", "facilities", "job_orders", "assignments", "timesheets"
+)])
+async def seed_database():
+    """Seed the database with demo data"""
+    seeded_collections = (
+        "users", "leads", "candidates", "documents", "facilities", "job_orders",
+        "assignments", "timesheets", "activities", "lead_capture_settings", "lead_audit_logs",
+    )
+    
+    # Clear existing data
+    await asyncio.gather(*(db[name].delete_many({}) for name in seeded_collections))
+    auth_cache.clear()
+    
+    # Hash any demo passwords not yet hashed, off the event loop and concurrently
+    seed_passwords = [credentials["password"] for credentials in DEMO_CREDENTIALS.values()]
+    unhashed = [pw for pw in seed_passwords if pw not in seed_password_hashes]
+    hashes = await asyncio.gather(*(hash_password_async(pw) for pw in unhashed))
+    seed_password_hashes.update(zip(unhashed, hashes))
+    
+    # Building and BSON-encoding the documents is pure CPU work, so it runs in a
+    # thread to keep the event loop serving other requests. Every id they
+    # reference is generated there, so the collections can then be written
+    # concurrently.
+    seeded = await asyncio.to_thread(encode_seed_data, datetime.now(timezone.utc), seed_password_hashes)
+    await asyncio.gather(*(
+        db[name].insert_many(docs, ordered=False)
+        for name, docs in seeded.items()
+    ))
     
     return {
         "message": "Database seeded successfully",
         "counts": {
-            "users": len(users),
-            "leads": len(leads),
-            "candidates": len(candidates),
-            "documents": len(documents),
-            "facilities": len(facilities),
-            "job_orders": len(job_orders),
-            "assignments": len(assignments),
-            "timesheets": len(timesheets),
-            "activities": len(activities)
+            "users": len(seeded["users"]),
+            "leads": len(seeded["leads"]),
+            "candidates": len(seeded["candidates"]),
+            "documents": len(seeded["documents"]),
+            "facilities": len(seeded["facilities"]),
+            "job_orders": len(seeded["job_orders"]),
+            "assignments": len(seeded["assignments"]),
+            "timesheets": len(seeded["timesheets"]),
+            "activities": len(seeded["activities"])
         },
-        "demo_credentials": {
-            "admin": {"email": "admin@mccareglobal.com", "password": "admin123"},
-            "recruiter": {"email": "recruiter@mccareglobal.com", "password": "recruiter123"},
-            "compliance": {"email": "compliance@mccareglobal.com", "password": "compliance123"},
-            "scheduler": {"email": "scheduler@mccareglobal.com", "password": "scheduler123"},
-            "finance": {"email": "finance@mccareglobal.com", "password": "finance123"},
-            "nurse": {"email": "nurse@mccareglobal.com", "password": "nurse123"}
-        }
+        "demo_credentials": DEMO_CREDENTIALS
     }
 
-# Root endpoint
+# Root endpoint (static, so encoded once at import)
+ROOT_RESPONSE_JSON = orjson.dumps({"message": "McCare Global ATS API", "version": "1.0.0"})
+
 @api_router.get("/")
 async def root():
-    return {"message": "McCare Global ATS API", "version": "1.0.0"}
+    return Response(content=ROOT_RESPONSE_JSON, media_type="application/json")
 
 # Health check endpoint (no auth required)
 @api_router.get("/health")
@@ -3839,16 +4275,25 @@ async def health_check():
     }
 
 # Include the router
-app.include_router(api_router)
+# Origins are parsed once; entries may be separated by ", " in the env file
+CORS_ORIGINS = tuple(
+    origin.strip() for origin in os.environ.get('CORS_ORIGINS', '*').split(',') if origin.strip()
+)
 
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
-    allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
+    allow_origins=CORS_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
 )
 
+app.include_router(api_router)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await notification_service.aclose()
+    await activity_log.aclose()
+    password_executor.shutdown(wait=False)
     client.close()
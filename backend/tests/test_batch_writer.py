@@ -0,0 +1,97 @@
+"""
+Unit tests for the background batch writer (backend/batch_writer.py):
+- Documents are written in batches of at most batch_size
+- aclose() writes everything queued, including the batch being collected
+  and documents queued while an insert_many is still in flight
+- Insert failures are logged, not raised
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from batch_writer import BatchWriter
+
+
+class FakeCollection:
+    """Records insert_many calls, optionally taking a while to answer"""
+
+    name = "fake"
+
+    def __init__(self, delay: float = 0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.batches = []
+
+    async def insert_many(self, documents, ordered=True):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("insert failed")
+        self.batches.append(list(documents))
+
+    @property
+    def documents(self):
+        return [doc for batch in self.batches for doc in batch]
+
+
+class TestBatchWriter:
+    """Test BatchWriter flushing and shutdown"""
+
+    def test_aclose_writes_every_document(self):
+        collection = FakeCollection()
+
+        async def run():
+            writer = BatchWriter(collection, batch_size=10, flush_interval=60)
+            for i in range(25):
+                writer.add({"n": i})
+            await asyncio.sleep(0)
+            await writer.aclose()
+
+        asyncio.run(run())
+        assert [doc["n"] for doc in collection.documents] == list(range(25))
+        assert all(len(batch) <= 10 for batch in collection.batches)
+
+    def test_aclose_waits_for_in_flight_write(self):
+        collection = FakeCollection(delay=0.05)
+
+        async def run():
+            writer = BatchWriter(collection, batch_size=5, flush_interval=0.01)
+            for i in range(5):
+                writer.add({"n": i})
+            await asyncio.sleep(0.02)  # first batch is now being inserted
+            for i in range(5, 8):
+                writer.add({"n": i})
+            await writer.aclose()
+
+        asyncio.run(run())
+        assert sorted(doc["n"] for doc in collection.documents) == list(range(8))
+
+    def test_aclose_without_documents(self):
+        collection = FakeCollection()
+        asyncio.run(BatchWriter(collection).aclose())
+        assert collection.batches == []
+
+    def test_flushes_after_interval(self):
+        collection = FakeCollection()
+
+        async def run():
+            writer = BatchWriter(collection, batch_size=100, flush_interval=0.01)
+            writer.add({"n": 1})
+            await asyncio.sleep(0.05)
+            written = list(collection.documents)
+            await writer.aclose()
+            return written
+
+        assert asyncio.run(run()) == [{"n": 1}]
+
+    def test_failed_insert_is_logged(self, caplog):
+        collection = FakeCollection(fail=True)
+
+        async def run():
+            writer = BatchWriter(collection)
+            writer.add({"n": 1})
+            await writer.aclose()
+
+        asyncio.run(run())
+        assert "Failed to write 1 document(s) to fake" in caplog.text
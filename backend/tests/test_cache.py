@@ -0,0 +1,85 @@
+"""
+Unit tests for the in-process TTL cache (backend/cache.py):
+- Expiry, per-entry TTL and LRU eviction
+- clear() bumps the generation
+- Concurrent access from several threads (password verification runs in a pool)
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cache import TTLCache
+
+
+class TestTTLCache:
+    """Test TTLCache behaviour"""
+
+    def test_get_and_set(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+        assert cache.get("missing", "default") == "default"
+
+    def test_entries_expire(self):
+        cache = TTLCache(maxsize=10, ttl=0.01)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=60)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert len(cache) == 1
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_pop(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+        assert cache.pop("a") == 1
+        assert cache.pop("a", "gone") == "gone"
+
+    def test_clear_bumps_generation(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+        generation = cache.generation
+        cache.clear()
+        assert cache.generation == generation + 1
+        assert len(cache) == 0
+
+    def test_concurrent_access_from_threads(self):
+        """Threads racing on the same expiring keys must never raise"""
+        cache = TTLCache(maxsize=8, ttl=0.0005)
+        errors = []
+
+        def worker():
+            try:
+                for i in range(5000):
+                    key = i % 16
+                    cache.set(key, i)
+                    cache.get(key)
+                    if i % 100 == 0:
+                        cache.pop(key)
+                    if i % 1000 == 0:
+                        cache.clear()
+            except Exception as e:  # pragma: no cover - only on failure
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(cache) <= 8
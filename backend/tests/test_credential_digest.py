@@ -0,0 +1,165 @@
+"""
+Unit tests for the expiring credential sweep (backend/notification_service.py):
+- Alerts sharing a recipient list are emailed as one digest
+- Alerts are counted and thresholds marked notified only after the digest is sent
+- A failed digest leaves its alerts uncounted and unmarked for the next sweep
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pymongo")
+pytest.importorskip("jinja2")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from email_provider import EmailResult
+from notification_service import DEFAULT_SETTINGS, NotificationService
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return list(self.docs)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeCollection:
+    """Just enough of a Motor collection for the sweep"""
+
+    def __init__(self, name, docs=None):
+        self.name = name
+        self.docs = docs or []
+        self.inserted = []
+        self.bulk_writes = []
+
+    def find(self, *args, **kwargs):
+        return FakeCursor(self.docs)
+
+    def aggregate(self, pipeline):
+        return FakeCursor(self.docs)
+
+    async def insert_many(self, documents, ordered=True):
+        self.inserted.extend(documents)
+
+    async def bulk_write(self, requests, ordered=True):
+        self.bulk_writes.extend(requests)
+
+
+class FakeDatabase:
+    def __init__(self, documents, users):
+        self.documents = FakeCollection("documents", documents)
+        self.users = FakeCollection("users", users)
+        self.notifications = FakeCollection("notifications")
+        self.notification_logs = FakeCollection("notification_logs")
+        self.notification_settings = FakeCollection("notification_settings")
+
+
+class FakeEmailProvider:
+    """Records sends; fails for any recipient list containing a failing address"""
+
+    provider_name = "fake"
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.sent = []
+
+    async def send_email(self, to, subject, html, **kwargs):
+        self.sent.append({"to": sorted(to), "subject": subject, "metadata": kwargs.get("metadata")})
+        return EmailResult(success=not self.failing & set(to), message_id="fake")
+
+    async def aclose(self):
+        pass
+
+
+def credential(doc_id, days_until, candidate_email=None):
+    """A sweep aggregation result: document joined to its candidate"""
+    return {
+        "id": doc_id,
+        "expiry_date": "2030-01-01",
+        "candidate_id": f"cand-{doc_id}",
+        "document_type": "BLS/ACLS Certification",
+        "status": "Verified",
+        "last_notified": {},
+        "days_until": days_until,
+        "candidate": {
+            "id": f"cand-{doc_id}",
+            "first_name": "Test",
+            "last_name": doc_id,
+            "email": candidate_email,
+        },
+    }
+
+
+def run_sweep(documents, provider, **settings):
+    users = [{"id": "user-1", "email": "compliance@example.com"}]
+    db = FakeDatabase(documents, users)
+    service = NotificationService(db, base_url="http://test")
+    service.email_provider = provider
+    service._settings_cache = (
+        {**DEFAULT_SETTINGS, "expiring_thresholds": [30, 7], **settings}, time.monotonic()
+    )
+    summary = asyncio.run(service.check_expiring_credentials())
+    return summary, db
+
+
+class TestCredentialDigest:
+    """Test digest grouping and counting in check_expiring_credentials"""
+
+    def test_shared_recipients_get_one_digest(self):
+        provider = FakeEmailProvider()
+        documents = [credential("doc-1", 20), credential("doc-2", 5), credential("doc-3", -2)]
+        summary, db = run_sweep(documents, provider)
+
+        assert len(provider.sent) == 1
+        assert provider.sent[0]["to"] == ["compliance@example.com"]
+        assert provider.sent[0]["metadata"]["digest"] is True
+        assert summary["emails_sent"] == 1
+        assert summary["notifications_sent"] == 3
+        assert summary["by_threshold"] == {"30": 2}
+        # Expired alerts are not marked; threshold alerts are
+        marked = sorted(update._filter["id"] for update in db.documents.bulk_writes)
+        assert marked == ["doc-1", "doc-2"]
+        assert len(db.notifications.inserted) == 3
+
+    def test_separate_recipient_lists_get_separate_emails(self):
+        provider = FakeEmailProvider()
+        documents = [credential("doc-1", 20, "a@example.com"), credential("doc-2", 20, "b@example.com")]
+        summary, _ = run_sweep(documents, provider, expiring_notify_candidate=True)
+
+        assert sorted(sent["to"] for sent in provider.sent) == [
+            ["a@example.com", "compliance@example.com"],
+            ["b@example.com", "compliance@example.com"],
+        ]
+        assert summary["emails_sent"] == 2
+        assert summary["notifications_sent"] == 2
+
+    def test_failed_digest_is_not_counted_or_marked(self):
+        provider = FakeEmailProvider(failing={"b@example.com"})
+        documents = [credential("doc-1", 20, "a@example.com"), credential("doc-2", 20, "b@example.com")]
+        summary, db = run_sweep(documents, provider, expiring_notify_candidate=True)
+
+        assert summary["emails_sent"] == 1
+        assert summary["notifications_sent"] == 1
+        assert summary["by_threshold"] == {"30": 1}
+        assert [update._filter["id"] for update in db.documents.bulk_writes] == ["doc-1"]
+
+    def test_all_digests_failing(self):
+        provider = FakeEmailProvider(failing={"compliance@example.com"})
+        summary, db = run_sweep([credential("doc-1", 20), credential("doc-2", 5)], provider)
+
+        assert summary["emails_sent"] == 0
+        assert summary["notifications_sent"] == 0
+        assert summary["by_threshold"] == {}
+        assert db.documents.bulk_writes == []
@@ -0,0 +1,51 @@
+"""
+Unit tests for email template rendering (backend/email_templates.py):
+- Inline templates are compiled once per distinct source
+- SplitTemplate renders the same output as the full template
+- Autoescaping of inline templates
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("jinja2")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from email_templates import SplitTemplate, compile_template, render_template
+
+
+EMAIL_HTML = """<html><head><style>p { color: #333; }</style></head>
+<body><p>Hello {{ name }},</p>
+{% if items %}<ul>{% for item in items %}<li>{{ item }}</li>{% endfor %}</ul>{% endif %}
+<footer>McCare Global</footer></body></html>"""
+
+
+class TestCompileTemplate:
+    """Test inline template compilation"""
+
+    def test_same_source_is_compiled_once(self):
+        assert compile_template("<p>{{ a }}</p>") is compile_template("<p>{{ a }}</p>")
+
+    def test_render_template(self):
+        assert render_template("<p>Hello {{ name }}</p>", name="Jane") == "<p>Hello Jane</p>"
+
+    def test_values_are_escaped(self):
+        assert render_template("{{ v }}", v="<b>") == "&lt;b&gt;"
+
+
+class TestSplitTemplate:
+    """Test SplitTemplate against the equivalent full template"""
+
+    def test_matches_full_template(self):
+        context = {"name": "Jane", "items": ["BLS", "CRC"]}
+        assert SplitTemplate(EMAIL_HTML).render(**context) == render_template(EMAIL_HTML, **context)
+
+    def test_constant_markup_is_kept_verbatim(self):
+        template = SplitTemplate(EMAIL_HTML)
+        assert template.prefix.startswith("<html><head><style>")
+        assert template.suffix.endswith("</footer></body></html>")
+
+    def test_source_without_tags(self):
+        assert SplitTemplate("<p>Static</p>").render(name="ignored") == "<p>Static</p>"
@@ -0,0 +1,148 @@
+"""
+Test suite for list endpoint responses including:
+- Cached list responses are invalidated by writes (POST, PUT, DELETE)
+- Paged list requests carry the total in an X-Total-Count header
+- Credential dates sent as timestamps are stored as YYYY-MM-DD
+"""
+import pytest
+import requests
+import os
+import uuid
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+@pytest.fixture(scope="module")
+def api_client():
+    """Shared requests session"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+@pytest.fixture(scope="module")
+def auth_token(api_client):
+    """Get authentication token with admin credentials"""
+    response = api_client.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@mccareglobal.com",
+        "password": "admin123"
+    })
+    assert response.status_code == 200, f"Login failed: {response.text}"
+    token = response.json().get("access_token")
+    assert token, "No access_token in response"
+    return token
+
+@pytest.fixture(scope="module")
+def authenticated_client(api_client, auth_token):
+    """Session with auth header"""
+    api_client.headers.update({"Authorization": f"Bearer {auth_token}"})
+    return api_client
+
+
+class TestResponseCache:
+    """Test that cached list responses never outlive a write"""
+
+    def test_repeated_list_is_identical(self, authenticated_client):
+        """Two reads with no write in between return the same list"""
+        first = authenticated_client.get(f"{BASE_URL}/api/facilities")
+        second = authenticated_client.get(f"{BASE_URL}/api/facilities")
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert first.json() == second.json()
+
+    def test_create_update_delete_invalidate_list(self, authenticated_client):
+        """A cached list reflects a create, update and delete straight away"""
+        name = f"TEST_Cache_{uuid.uuid4().hex[:8]}"
+        # Warm the cache
+        authenticated_client.get(f"{BASE_URL}/api/facilities")
+
+        response = authenticated_client.post(f"{BASE_URL}/api/facilities", json={"name": name})
+        assert response.status_code == 200
+        facility_id = response.json()["id"]
+
+        try:
+            facilities = authenticated_client.get(f"{BASE_URL}/api/facilities").json()
+            assert any(f["id"] == facility_id for f in facilities), "New facility missing from cached list"
+
+            response = authenticated_client.put(
+                f"{BASE_URL}/api/facilities/{facility_id}", json={"name": f"{name}_renamed"}
+            )
+            assert response.status_code == 200
+            facilities = authenticated_client.get(f"{BASE_URL}/api/facilities").json()
+            names = {f["id"]: f["name"] for f in facilities}
+            assert names.get(facility_id) == f"{name}_renamed"
+        finally:
+            response = authenticated_client.delete(f"{BASE_URL}/api/facilities/{facility_id}")
+            assert response.status_code == 200
+
+        facilities = authenticated_client.get(f"{BASE_URL}/api/facilities").json()
+        assert all(f["id"] != facility_id for f in facilities), "Deleted facility still in cached list"
+
+
+class TestPagination:
+    """Test page/page_size on list endpoints"""
+
+    @pytest.mark.parametrize("path", ["candidates", "leads", "assignments", "timesheets"])
+    def test_paged_list_sets_total_count(self, authenticated_client, path):
+        """A paged request returns at most page_size items and the total as a header"""
+        response = authenticated_client.get(f"{BASE_URL}/api/{path}?page=1&page_size=2")
+        assert response.status_code == 200
+        data = response.json()
+        assert isinstance(data, list)
+        assert len(data) <= 2
+        assert "X-Total-Count" in response.headers
+        total = int(response.headers["X-Total-Count"])
+        assert total >= len(data)
+
+    def test_unpaged_list_has_no_total(self, authenticated_client):
+        """Without page the full list is returned as before"""
+        response = authenticated_client.get(f"{BASE_URL}/api/candidates")
+        assert response.status_code == 200
+        assert "X-Total-Count" not in response.headers
+
+    def test_timesheet_list_keeps_full_documents(self, authenticated_client):
+        """Paged timesheets carry their entries as well as the looked-up details"""
+        response = authenticated_client.get(f"{BASE_URL}/api/timesheets?page=1&page_size=5")
+        assert response.status_code == 200
+        for timesheet in response.json():
+            assert "entries" in timesheet
+            assert "candidate_name" in timesheet
+
+
+class TestDateNormalization:
+    """Test that credential expiry dates are stored date-only"""
+
+    def test_timestamp_expiry_date_is_stored_as_date(self, authenticated_client):
+        """Timestamps are cut to YYYY-MM-DD on create and update"""
+        response = authenticated_client.post(f"{BASE_URL}/api/documents", json={
+            "candidate_id": f"TEST_{uuid.uuid4().hex[:8]}",
+            "document_type": "nursing_license",
+            "file_url": "https://example.com/license.pdf",
+            "expiry_date": "2030-03-01T00:00:00Z"
+        })
+        assert response.status_code == 200
+        document = response.json()
+        assert document["expiry_date"] == "2030-03-01"
+
+        try:
+            response = authenticated_client.put(
+                f"{BASE_URL}/api/documents/{document['id']}",
+                json={"expiry_date": "2031-04-02T12:30:00+00:00"}
+            )
+            assert response.status_code == 200
+            assert response.json()["expiry_date"] == "2031-04-02"
+        finally:
+            authenticated_client.delete(f"{BASE_URL}/api/documents/{document['id']}")
+
+    def test_date_only_expiry_date_is_unchanged(self, authenticated_client):
+        """Plain dates are stored as given"""
+        response = authenticated_client.post(f"{BASE_URL}/api/documents", json={
+            "candidate_id": f"TEST_{uuid.uuid4().hex[:8]}",
+            "document_type": "crc",
+            "file_url": "https://example.com/crc.pdf",
+            "expiry_date": "2030-03-01"
+        })
+        assert response.status_code == 200
+        document = response.json()
+        try:
+            assert document["expiry_date"] == "2030-03-01"
+        finally:
+            authenticated_client.delete(f"{BASE_URL}/api/documents/{document['id']}")